@@ -0,0 +1,33 @@
+"""Added foreign key indexes
+
+Revision ID: 3b1f0a2d9c47
+Revises: cf5843895c82
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3b1f0a2d9c47'
+down_revision = 'cf5843895c82'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_questions_theme_id', 'questions', ['theme_id', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_answers_question_id',
+        'answers',
+        ['question_id', 'id'],
+        unique=False,
+        postgresql_include=['title', 'is_correct'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_answers_question_id', table_name='answers')
+    op.drop_index('ix_questions_theme_id', table_name='questions')
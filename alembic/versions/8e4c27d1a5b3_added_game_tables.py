@@ -0,0 +1,49 @@
+"""Added game tables
+
+Revision ID: 8e4c27d1a5b3
+Revises: 3b1f0a2d9c47
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4c27d1a5b3'
+down_revision = '3b1f0a2d9c47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('games',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('chat_id', sa.BigInteger(), nullable=False),
+    sa.Column('theme_id', sa.BigInteger(), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['theme_id'], ['themes.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_games_chat_id'), 'games', ['chat_id'], unique=False)
+    op.create_table('game_events',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('game_id', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.BigInteger(), nullable=False),
+    sa.Column('question_id', sa.BigInteger(), nullable=True),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('is_correct', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['game_id'], ['games.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_game_events_game_id'), 'game_events', ['game_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_game_events_game_id'), table_name='game_events')
+    op.drop_table('game_events')
+    op.drop_index(op.f('ix_games_chat_id'), table_name='games')
+    op.drop_table('games')
@@ -1,5 +1,4 @@
 from dataclasses import dataclass
-from hashlib import sha256
 from typing import Optional
 
 from sqlalchemy import Column, BigInteger, String
@@ -7,15 +6,12 @@ from sqlalchemy import Column, BigInteger, String
 from app.store.database.sqlalchemy_base import db
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Admin:
     id: int
     email: str
     password: Optional[str] = None
 
-    def is_password_valid(self, password: str):
-        return self.password == sha256(password.encode()).hexdigest()
-
     @classmethod
     def from_session(cls, session: Optional[dict]) -> Optional["Admin"]:
         return cls(id=session["admin"]["id"], email=session["admin"]["email"])
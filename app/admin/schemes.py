@@ -5,3 +5,36 @@ class AdminSchema(Schema):
     id = fields.Int(required=False)
     email = fields.Str(required=True)
     password = fields.Str(required=True, load_only=True)
+
+
+class PoolStatsSchema(Schema):
+    size = fields.Int()
+    checked_in = fields.Int()
+    checked_out = fields.Int()
+    overflow = fields.Int()
+
+
+class PollerStatsSchema(Schema):
+    queue_depth = fields.Int()
+    lag = fields.Float()
+    max_lag = fields.Float()
+    handled = fields.Int()
+
+
+class PollLatencySchema(Schema):
+    count = fields.Int()
+    sum = fields.Float()
+    # Cumulative counts by upper bound in seconds, as in Prometheus.
+    buckets = fields.Dict(keys=fields.Str(), values=fields.Int())
+
+
+class LongPollStatsSchema(Schema):
+    reconnects = fields.Int()
+    consecutive_failures = fields.Int()
+    skipped_updates = fields.Int()
+    latency = fields.Nested(PollLatencySchema)
+
+
+class BotStatsSchema(Schema):
+    poller = fields.Nested(PollerStatsSchema, allow_none=True)
+    long_poll = fields.Nested(LongPollStatsSchema)
@@ -1,36 +1,49 @@
-from aiohttp.web import HTTPForbidden, HTTPUnauthorized
+from aiohttp.web import HTTPForbidden
 from aiohttp_apispec import request_schema, response_schema
 from aiohttp_session import new_session
 
-from app.admin.schemes import AdminSchema
+from app.admin.schemes import AdminSchema, BotStatsSchema, PoolStatsSchema
 from app.web.app import View
+from app.web.mixins import AuthRequiredMixin
+from app.web.serializers import dump
 from app.web.utils import json_response
 
 
 class AdminLoginView(View):
+    # Hashing waits on the hasher's concurrency limit; a per-request
+    # transaction would keep a pooled connection checked out meanwhile.
+    unit_of_work = False
+
     @request_schema(AdminSchema)
     @response_schema(AdminSchema, 200)
     async def post(self):
         email = self.data["email"]
         password = self.data["password"]
 
-        manager_data = await self.store.admins.get_by_email(email)
+        manager_data = await self.store.admins.authenticate(email, password)
         if not manager_data:
             raise HTTPForbidden
 
-        if not manager_data.is_password_valid(password):
-            raise HTTPForbidden
-
         session = await new_session(self.request)
-        raw_manager_data = AdminSchema().dump(manager_data)
+        raw_manager_data = dump(AdminSchema, manager_data)
         session["admin"] = raw_manager_data
 
         return json_response(data=raw_manager_data)
 
 
-class AdminCurrentView(View):
+class AdminCurrentView(AuthRequiredMixin, View):
     @response_schema(AdminSchema, 200)
     async def get(self):
-        if not (manager_data := self.request.admin):
-            raise HTTPUnauthorized
-        return json_response(data=AdminSchema().dump(manager_data))
+        return json_response(data=dump(AdminSchema, self.request.admin))
+
+
+class AdminPoolStatsView(AuthRequiredMixin, View):
+    @response_schema(PoolStatsSchema, 200)
+    async def get(self):
+        return json_response(data=dump(PoolStatsSchema, self.database.pool_stats()))
+
+
+class AdminBotStatsView(AuthRequiredMixin, View):
+    @response_schema(BotStatsSchema, 200)
+    async def get(self):
+        return json_response(data=dump(BotStatsSchema, self.store.vk_api.stats()))
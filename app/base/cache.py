@@ -0,0 +1,53 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """LRU cache whose entries also expire ``ttl`` seconds after being set.
+
+    Keys are tuples, so that a whole group of entries can be dropped at once
+    with :meth:`invalidate`.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[tuple[Hashable, ...], tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: tuple[Hashable, ...]) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is not None and item[0] < monotonic():
+            del self._data[key]
+            item = None
+        if item is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def set(self, key: tuple[Hashable, ...], value: Any) -> None:
+        self._data[key] = (monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: tuple[Hashable, ...]) -> None:
+        self._data.pop(key, None)
+
+    def invalidate(self, *prefix: Hashable) -> None:
+        size = len(prefix)
+        for key in [key for key in self._data if key[:size] == prefix]:
+            del self._data[key]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
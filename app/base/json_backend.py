@@ -0,0 +1,44 @@
+"""JSON encoding with the fastest backend available.
+
+orjson or msgspec is used when installed, the standard library otherwise.
+``dumps`` always returns ``str`` and ``loads`` accepts ``str`` or ``bytes``.
+Non-string dict keys, such as the row indexes in marshmallow's nested error
+messages, are written as strings by every backend.
+"""
+import json
+from functools import partial
+from typing import Any, Callable
+
+BACKEND: str
+dumps_bytes: Callable[[Any], bytes]
+loads: Callable[[str | bytes], Any]
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if orjson is not None:
+    BACKEND = "orjson"
+    dumps_bytes = partial(orjson.dumps, option=orjson.OPT_NON_STR_KEYS)
+    loads = orjson.loads
+elif msgspec is not None:
+    BACKEND = "msgspec"
+    dumps_bytes = msgspec.json.encode
+    loads = msgspec.json.decode
+else:
+    BACKEND = "json"
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode()
+
+    loads = json.loads
+
+
+def dumps(obj: Any) -> str:
+    return dumps_bytes(obj).decode()
@@ -0,0 +1,24 @@
+from bisect import bisect_left
+
+
+class Histogram:
+    """Cumulative bucket histogram in the spirit of Prometheus histograms."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def stats(self) -> dict:
+        cumulative = 0
+        buckets = {}
+        for le, count in zip((*self.buckets, float("inf")), self.counts):
+            cumulative += count
+            buckets[str(le)] = cumulative
+        return {"count": self.count, "sum": self.sum, "buckets": buckets}
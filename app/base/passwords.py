@@ -0,0 +1,115 @@
+import asyncio
+import base64
+import binascii
+import hashlib
+import hmac
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Optional
+
+SCRYPT_N = 2**14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_SIZE = 16
+KEY_SIZE = 32
+SCHEME = "scrypt"
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode(),
+        salt=salt,
+        n=n,
+        r=r,
+        p=p,
+        maxmem=2 * 128 * n * r * p,
+        dklen=KEY_SIZE,
+    )
+
+
+def _is_legacy(hashed: str) -> bool:
+    return len(hashed) == 64 and "$" not in hashed
+
+
+class PasswordHasher:
+    """Hashes passwords with scrypt off the event loop.
+
+    Hashes look like ``scrypt$n$r$p$salt$key``.  Unsalted sha256 hex
+    digests from before are still verified; :meth:`needs_rehash` tells the
+    caller to replace them.  At most ``concurrency`` hashes run at once,
+    other callers wait their turn instead of piling onto the executor.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        executor: Optional[Executor] = None,
+        n: int = SCRYPT_N,
+        r: int = SCRYPT_R,
+        p: int = SCRYPT_P,
+    ):
+        self.n = n
+        self.r = r
+        self.p = p
+        self.concurrency = concurrency
+        self._own_executor = executor is None
+        self._executor = executor
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def _run(self, password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.concurrency, thread_name_prefix="password-hasher"
+            )
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, _scrypt, password, salt, n, r, p
+            )
+
+    async def hash(self, password: str) -> str:
+        salt = os.urandom(SALT_SIZE)
+        key = await self._run(password, salt, self.n, self.r, self.p)
+        return "$".join(
+            (SCHEME, str(self.n), str(self.r), str(self.p), _b64encode(salt), _b64encode(key))
+        )
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        if _is_legacy(hashed):
+            return hmac.compare_digest(hashed, hashlib.sha256(password.encode()).hexdigest())
+        try:
+            scheme, n, r, p, salt, key = hashed.split("$")
+        except ValueError:
+            return False
+        if scheme != SCHEME:
+            return False
+        try:
+            actual = await self._run(
+                password, base64.b64decode(salt), int(n), int(r), int(p)
+            )
+            return hmac.compare_digest(actual, base64.b64decode(key))
+        except (binascii.Error, ValueError):
+            # A corrupted hash matches no password.
+            return False
+
+    async def verify_dummy(self, password: str) -> bool:
+        """Take as long as verifying a current hash, then fail.
+
+        Used when there is no hash to check, so that the response time
+        does not reveal whether the account exists.
+        """
+        await self._run(password, bytes(SALT_SIZE), self.n, self.r, self.p)
+        return False
+
+    def needs_rehash(self, hashed: str) -> bool:
+        if _is_legacy(hashed):
+            return True
+        return hashed.split("$")[:4] != [SCHEME, str(self.n), str(self.r), str(self.p)]
+
+    def close(self):
+        if self._own_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,113 @@
+import asyncio
+import inspect
+import math
+from asyncio import Task
+from logging import getLogger
+from typing import Any, Callable, Optional
+
+
+class Timer:
+    __slots__ = ("callback", "args", "rounds", "slot", "cancelled")
+
+    def __init__(self, callback: Callable[..., Any], args: tuple, rounds: int, slot: set):
+        self.callback = callback
+        self.args = args
+        self.rounds = rounds
+        self.slot = slot
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        if not self.cancelled:
+            self.cancelled = True
+            self.slot.discard(self)
+
+
+class TimerWheel:
+    """Hashed timing wheel: ``slots`` buckets of ``tick`` seconds each.
+
+    Scheduling and cancelling are O(1) set operations; a single task wakes
+    up once per tick and fires the timers of the current bucket.  Timers
+    further away than one revolution wait there for more ``rounds``.
+    Deadlines are rounded up to the next tick, so a timer may fire up to
+    ``tick`` seconds late but never early.
+
+    A callback may return an awaitable, which is run as a task.
+    """
+
+    def __init__(self, tick: float = 0.1, slots: int = 512):
+        self.tick = tick
+        self.slots: list[set[Timer]] = [set() for _ in range(slots)]
+        self.logger = getLogger("timer_wheel")
+        self._position = 0
+        self._ticked_at: Optional[float] = None
+        self._task: Optional[Task] = None
+        self._tasks: set[Task] = set()
+
+    def __len__(self) -> int:
+        return sum(len(slot) for slot in self.slots)
+
+    def call_later(self, delay: float, callback: Callable[..., Any], *args: Any) -> Timer:
+        elapsed = 0.0
+        if self._ticked_at is not None:
+            elapsed = asyncio.get_running_loop().time() - self._ticked_at
+        ticks = max(1, math.ceil((elapsed + delay) / self.tick))
+        slot = self.slots[(self._position + ticks) % len(self.slots)]
+        timer = Timer(callback, args, (ticks - 1) // len(self.slots), slot)
+        slot.add(timer)
+        return timer
+
+    def advance(self, ticks: int = 1) -> None:
+        for _ in range(ticks):
+            self._position = (self._position + 1) % len(self.slots)
+            slot = self.slots[self._position]
+            for timer in list(slot):
+                if timer.rounds:
+                    timer.rounds -= 1
+                    continue
+                slot.discard(timer)
+                self._fire(timer)
+
+    def _fire(self, timer: Timer) -> None:
+        try:
+            result = timer.callback(*timer.args)
+        except Exception as e:
+            self.logger.error("Exception", exc_info=e)
+            return
+        if inspect.isawaitable(result):
+            task = asyncio.ensure_future(result)
+            self._tasks.add(task)
+            task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            self.logger.error("Exception", exc_info=task.exception())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        self._ticked_at = loop.time()
+        while True:
+            await asyncio.sleep(self._ticked_at + self.tick - loop.time())
+            # Catch up on ticks missed while the loop was busy, one at a time,
+            # so that timers set by their callbacks count from the right tick.
+            while loop.time() - self._ticked_at >= self.tick:
+                self._ticked_at += self.tick
+                self.advance()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            self._ticked_at = None
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def clear(self) -> None:
+        for slot in self.slots:
+            for timer in slot:
+                timer.cancelled = True
+            slot.clear()
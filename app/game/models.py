@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, ForeignKey, String, Uuid
+
+from app.store.database.sqlalchemy_base import db
+
+EVENT_ANSWER = "answer"
+EVENT_SKIP = "skip"
+EVENT_TIMEOUT = "timeout"
+
+
+@dataclass(slots=True, frozen=True)
+class Game:
+    id: UUID
+    chat_id: int
+    theme_id: int | None
+    started_at: datetime
+    finished_at: datetime | None = None
+
+
+@dataclass(slots=True, frozen=True)
+class GameEvent:
+    game_id: UUID
+    user_id: int
+    question_id: int | None
+    kind: str
+    is_correct: bool | None
+    created_at: datetime
+
+
+class GameModel(db):
+    __tablename__ = "games"
+
+    # Generated by the bot, so events can refer to a game before it is saved.
+    id = Column(Uuid(), primary_key=True)
+    chat_id = Column(BigInteger(), nullable=False, index=True)
+    theme_id = Column(ForeignKey("themes.id", ondelete="SET NULL"), nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    @property
+    def dataclass(self) -> Game:
+        return Game(
+            id=self.id,
+            chat_id=self.chat_id,
+            theme_id=self.theme_id,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+        )
+
+
+class GameEventModel(db):
+    __tablename__ = "game_events"
+
+    id = Column(BigInteger(), primary_key=True)
+    game_id = Column(
+        ForeignKey("games.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    user_id = Column(BigInteger(), nullable=False)
+    question_id = Column(ForeignKey("questions.id", ondelete="SET NULL"), nullable=True)
+    kind = Column(String(20), nullable=False)
+    is_correct = Column(Boolean(), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    @property
+    def dataclass(self) -> GameEvent:
+        return GameEvent(
+            game_id=self.game_id,
+            user_id=self.user_id,
+            question_id=self.question_id,
+            kind=self.kind,
+            is_correct=self.is_correct,
+            created_at=self.created_at,
+        )
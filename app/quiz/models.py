@@ -1,18 +1,18 @@
 from dataclasses import dataclass
 
-from sqlalchemy import BigInteger, Column, String, Boolean, ForeignKey
+from sqlalchemy import BigInteger, Column, String, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from app.store.database.sqlalchemy_base import db
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Theme:
     id: int | None
     title: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Question:
     id: int | None
     title: str
@@ -20,7 +20,7 @@ class Question:
     answers: list["Answer"]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Answer:
     title: str
     is_correct: bool
@@ -42,6 +42,16 @@ class ThemeModel(db):
 
 class AnswerModel(db):
     __tablename__ = "answers"
+    __table_args__ = (
+        # Covers loading a question's answers in order with an index-only
+        # scan, and the ON DELETE CASCADE lookup.
+        Index(
+            "ix_answers_question_id",
+            "question_id",
+            "id",
+            postgresql_include=["title", "is_correct"],
+        ),
+    )
 
     id = Column(BigInteger(), primary_key=True)
     title = Column(String(50), nullable=False)
@@ -58,11 +68,13 @@ class AnswerModel(db):
 
 class QuestionModel(db):
     __tablename__ = "questions"
+    # Serves theme filtering together with keyset pagination by id.
+    __table_args__ = (Index("ix_questions_theme_id", "theme_id", "id"),)
 
     id = Column(BigInteger(), primary_key=True)
     title = Column(String(50), nullable=False, unique=True)
     theme_id = Column(ForeignKey("themes.id", ondelete="CASCADE"), nullable=False)
-    answers = relationship("AnswerModel")
+    answers = relationship("AnswerModel", order_by="AnswerModel.id")
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -2,8 +2,10 @@ import typing
 
 from app.quiz.views import (
     QuestionAddView,
+    QuestionImportView,
     QuestionListView,
     ThemeAddView,
+    ThemeBulkAddView,
     ThemeListView,
 )
 
@@ -13,6 +15,8 @@ if typing.TYPE_CHECKING:
 
 def setup_routes(app: "Application"):
     app.router.add_view("/quiz.add_theme", ThemeAddView)
+    app.router.add_view("/quiz.add_themes", ThemeBulkAddView)
     app.router.add_view("/quiz.list_themes", ThemeListView)
     app.router.add_view("/quiz.add_question", QuestionAddView)
     app.router.add_view("/quiz.list_questions", QuestionListView)
+    app.router.add_view("/quiz.import_questions", QuestionImportView)
@@ -1,4 +1,4 @@
-from marshmallow import Schema, fields
+from marshmallow import Schema, ValidationError, fields, validate, validates_schema
 
 
 class ThemeSchema(Schema):
@@ -12,6 +12,14 @@ class QuestionSchema(Schema):
     theme_id = fields.Int(required=True)
     answers = fields.Nested("AnswerSchema", many=True, required=True)
 
+    @validates_schema(skip_on_field_errors=True)
+    def validate_answers(self, data: dict, **_):
+        answers = data["answers"]
+        if len(answers) < 2:
+            raise ValidationError("Question must have at least two answers.", "answers")
+        if len([answer for answer in answers if answer["is_correct"]]) != 1:
+            raise ValidationError("Question must have exactly one correct answer.", "answers")
+
 
 class AnswerSchema(Schema):
     title = fields.Str(required=True)
@@ -22,9 +30,29 @@ class ThemeListSchema(Schema):
     themes = fields.Nested(ThemeSchema, many=True)
 
 
+class ThemeTitlesSchema(Schema):
+    titles = fields.List(fields.Str(), required=True)
+
+
 class ThemeIdSchema(Schema):
     theme_id = fields.Int()
+    limit = fields.Int(validate=validate.Range(min=1))
+    after_id = fields.Int()
+    stream = fields.Bool()
 
 
 class ListQuestionSchema(Schema):
     questions = fields.Nested(QuestionSchema, many=True)
+
+
+class QuestionImportResultSchema(Schema):
+    index = fields.Int()
+    status = fields.Str()
+    id = fields.Int()
+    errors = fields.Dict()
+
+
+class QuestionImportSchema(Schema):
+    created = fields.Int()
+    failed = fields.Int()
+    results = fields.Nested(QuestionImportResultSchema, many=True)
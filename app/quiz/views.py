@@ -1,18 +1,37 @@
-from aiohttp.web_exceptions import HTTPConflict, HTTPBadRequest, HTTPNotFound
+from typing import Any, AsyncIterator
+
+from aiohttp.web_exceptions import (
+    HTTPBadRequest,
+    HTTPConflict,
+    HTTPNotFound,
+    HTTPRequestEntityTooLarge,
+)
 from aiohttp_apispec import querystring_schema, request_schema, response_schema
+from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
 
-from app.quiz.models import Answer
+from app.base.json_backend import loads
+from app.quiz.models import Answer, Question
 from app.quiz.schemes import (
     ListQuestionSchema,
+    QuestionImportSchema,
     QuestionSchema,
     ThemeIdSchema,
     ThemeListSchema,
     ThemeSchema,
+    ThemeTitlesSchema,
 )
 from app.web.app import View
 from app.web.mixins import AuthRequiredMixin
-from app.web.utils import json_response
+from app.web.serializers import dump, dumper
+from app.web.utils import json_response, ndjson_response
+
+FOREIGN_KEY_VIOLATION = "23503"
+UNIQUE_VIOLATION = "23505"
+
+IMPORT_BATCH_SIZE = 1000
+# JSON array uploads are parsed whole, unlike NDJSON which is streamed.
+IMPORT_MAX_SIZE = 64 * 1024 * 1024
 
 
 class ThemeAddView(AuthRequiredMixin, View):
@@ -21,19 +40,26 @@ class ThemeAddView(AuthRequiredMixin, View):
     async def post(self):
         title = self.data["title"]
 
-        existing_theme = await self.store.quizzes.get_theme_by_title(title)
-        if existing_theme:
+        themes = await self.store.quizzes.create_themes([title])
+        if not themes:
             raise HTTPConflict
 
-        theme = await self.store.quizzes.create_theme(title=title)
-        return json_response(data=ThemeSchema().dump(theme))
+        return json_response(data=dump(ThemeSchema, themes[0]))
+
+
+class ThemeBulkAddView(AuthRequiredMixin, View):
+    @request_schema(ThemeTitlesSchema)
+    @response_schema(ThemeListSchema)
+    async def post(self):
+        themes = await self.store.quizzes.create_themes(self.data["titles"])
+        return json_response(data=dump(ThemeListSchema, {"themes": themes}))
 
 
 class ThemeListView(AuthRequiredMixin, View):
     @response_schema(ThemeListSchema)
     async def get(self):
         themes = await self.store.quizzes.list_themes()
-        return json_response(data=ThemeListSchema().dump({"themes": themes}))
+        return json_response(data=dump(ThemeListSchema, {"themes": themes}))
 
 
 class QuestionAddView(AuthRequiredMixin, View):
@@ -44,39 +70,138 @@ class QuestionAddView(AuthRequiredMixin, View):
         theme_id = self.data["theme_id"]
         answers: list[dict] = self.data["answers"]
 
-        existing_question = await self.store.quizzes.get_question_by_title(title)
-        if existing_question:
-            raise HTTPConflict
-
-        theme = await self.store.quizzes.get_theme_by_id(theme_id)
-        if not theme:
-            raise HTTPNotFound
-
-        if len(answers) < 2:
-            raise HTTPBadRequest
-
-        correct_answers = list(filter(lambda answer: answer["is_correct"], answers))
-        if len(correct_answers) != 1:
-            raise HTTPBadRequest
-
-        question = await self.store.quizzes.create_question(
-            title=title,
-            theme_id=theme_id,
-            answers=[Answer(**answer) for answer in answers],
-        )
-        return json_response(data=QuestionSchema().dump(question))
+        try:
+            question = await self.store.quizzes.create_question(
+                title=title,
+                theme_id=theme_id,
+                answers=[Answer(**answer) for answer in answers],
+            )
+        except IntegrityError as e:
+            if e.orig.pgcode == FOREIGN_KEY_VIOLATION:
+                raise HTTPNotFound
+            if e.orig.pgcode == UNIQUE_VIOLATION:
+                raise HTTPConflict
+            raise
+        return json_response(data=dump(QuestionSchema, question))
 
 
 class QuestionListView(AuthRequiredMixin, View):
     @querystring_schema(ThemeIdSchema)
     @response_schema(ListQuestionSchema)
     async def get(self):
-        theme_id = self.request["querystring"].get("theme_id")
+        querystring = self.request["querystring"]
+        theme_id = querystring.get("theme_id")
+        limit = querystring.get("limit")
+        after_id = querystring.get("after_id")
 
         if theme_id:
             theme = await self.store.quizzes.get_theme_by_id(theme_id)
             if not theme:
                 raise HTTPNotFound
 
-        questions = await self.store.quizzes.list_questions(theme_id)
-        return json_response(data=ListQuestionSchema().dump({"questions": questions}))
+        if querystring.get("stream"):
+            dump_question = dumper(QuestionSchema)
+            questions = self.store.quizzes.stream_questions(theme_id, limit, after_id)
+            return await ndjson_response(
+                self.request, (dump_question(question) async for question in questions)
+            )
+
+        questions = await self.store.quizzes.list_questions(theme_id, limit, after_id)
+        return json_response(data=dump(ListQuestionSchema, {"questions": questions}))
+
+
+class QuestionImportView(AuthRequiredMixin, View):
+    # Every batch commits on its own rather than holding a connection while
+    # the whole upload is read.
+    unit_of_work = False
+
+    @response_schema(QuestionImportSchema)
+    async def post(self):
+        results = []
+        batch = []
+        async for row in self._rows():
+            batch.append(row)
+            if len(batch) == IMPORT_BATCH_SIZE:
+                results.extend(await self._import_batch(len(results), batch))
+                batch = []
+        if batch:
+            results.extend(await self._import_batch(len(results), batch))
+
+        created = len([result for result in results if result["status"] == "created"])
+        return json_response(
+            data=dump(
+                QuestionImportSchema,
+                {"created": created, "failed": len(results) - created, "results": results},
+            )
+        )
+
+    async def _rows(self) -> AsyncIterator[Any]:
+        if self.request.content_type == "application/x-ndjson":
+            async for line in self.request.content:
+                if not line.strip():
+                    continue
+                try:
+                    yield loads(line)
+                except ValueError:
+                    yield None
+            return
+
+        # Read the body by hand: request.json() is capped by the app-wide
+        # client_max_size, which is meant for ordinary requests.
+        content_length = self.request.content_length or 0
+        if content_length > IMPORT_MAX_SIZE:
+            raise HTTPRequestEntityTooLarge(IMPORT_MAX_SIZE, content_length)
+        body = bytearray()
+        async for chunk in self.request.content.iter_any():
+            body += chunk
+            if len(body) > IMPORT_MAX_SIZE:
+                raise HTTPRequestEntityTooLarge(IMPORT_MAX_SIZE, len(body))
+        try:
+            rows = loads(body)
+        except ValueError:
+            raise HTTPBadRequest
+        if not isinstance(rows, list):
+            raise HTTPBadRequest
+        for row in rows:
+            yield row
+
+    async def _import_batch(self, offset: int, rows: list[Any]) -> list[dict]:
+        schema = QuestionSchema()
+        results: list[dict] = []
+        loaded: list[tuple[int, dict]] = []
+        for index, row in enumerate(rows, start=offset):
+            try:
+                loaded.append((index, schema.load(row)))
+            except ValidationError as e:
+                results.append({"index": index, "status": "invalid", "errors": e.messages})
+
+        theme_ids = await self.store.quizzes.get_existing_theme_ids(
+            {data["theme_id"] for _, data in loaded}
+        )
+        valid: list[tuple[int, Question]] = []
+        for index, data in loaded:
+            if data["theme_id"] not in theme_ids:
+                results.append({"index": index, "status": "theme_not_found"})
+                continue
+            question = Question(
+                id=None,
+                title=data["title"],
+                theme_id=data["theme_id"],
+                answers=[Answer(**answer) for answer in data["answers"]],
+            )
+            valid.append((index, question))
+
+        try:
+            created = await self.store.quizzes.create_questions(
+                [question for _, question in valid]
+            )
+        except IntegrityError:
+            results.extend({"index": index, "status": "failed"} for index, _ in valid)
+            created = []
+        for (index, _), question in zip(valid, created):
+            if question is None:
+                results.append({"index": index, "status": "conflict"})
+            else:
+                results.append({"index": index, "status": "created", "id": question.id})
+
+        return sorted(results, key=lambda result: result["index"])
@@ -10,17 +10,24 @@ class Store:
     def __init__(self, app: "Application"):
         from app.store.bot.manager import BotManager
         from app.store.admin.accessor import AdminAccessor
+        from app.store.game.accessor import GameAccessor
         from app.store.quiz.accessor import QuizAccessor
+        from app.store.scheduler.accessor import SchedulerAccessor
         from app.store.vk_api.accessor import VkApiAccessor
 
+        self.scheduler = SchedulerAccessor(app)
         self.quizzes = QuizAccessor(app)
         self.admins = AdminAccessor(app)
         self.vk_api = VkApiAccessor(app)
+        # After vk_api, so the final flush sees the updates the poller
+        # drains while stopping.
+        self.games = GameAccessor(app)
         self.bots_manager = BotManager(app)
 
 
 def setup_store(app: "Application"):
     app.database = Database(app)
     app.on_startup.append(app.database.connect)
-    app.on_cleanup.append(app.database.disconnect)
     app.store = Store(app)
+    # Last, so the accessors can still write while they shut down.
+    app.on_cleanup.append(app.database.disconnect)
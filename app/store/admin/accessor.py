@@ -1,28 +1,56 @@
 import typing
-from hashlib import sha256
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from app.admin.models import Admin, AdminModel
 from app.base.base_accessor import BaseAccessor
+from app.base.passwords import PasswordHasher
 
 if typing.TYPE_CHECKING:
     from app.web.app import Application
 
 
 class AdminAccessor(BaseAccessor):
+    def __init__(self, app: "Application", *args, **kwargs):
+        super().__init__(app, *args, **kwargs)
+        self.hasher = PasswordHasher(concurrency=app.config.admin.hash_concurrency)
+
+    async def disconnect(self, app: "Application"):
+        self.hasher.close()
+
     async def get_by_email(self, email: str) -> Admin | None:
         query = select(AdminModel).where(AdminModel.email == email)
-        async with self.app.database.session.begin() as session:
+        async with self.app.database.read_session() as session:
             admin = (await session.scalars(query)).first()
         if not admin:
             return None
         return admin.dataclass
 
     async def create_admin(self, email: str, password: str) -> Admin:
-        admin = AdminModel(email=email, password=sha256(password.encode()).hexdigest())
-        async with self.app.database.session.begin() as session:
+        admin = AdminModel(email=email, password=await self.hasher.hash(password))
+        async with self.app.database.write_session() as session:
             session.add(admin)
-            await session.commit()
-        return AdminModel.dataclass
+        return admin.dataclass
+
+    async def authenticate(self, email: str, password: str) -> Admin | None:
+        """Return the admin if the password matches, rehashing outdated hashes."""
+        admin = await self.get_by_email(email)
+        if not admin:
+            await self.hasher.verify_dummy(password)
+            return None
+        if not await self.hasher.verify(password, admin.password):
+            return None
+        if self.hasher.needs_rehash(admin.password):
+            await self._update_password(admin, await self.hasher.hash(password))
+        return admin
 
+    async def _update_password(self, admin: Admin, hashed: str):
+        # Only replace the hash we verified, so a concurrent password
+        # change is never overwritten.
+        query = (
+            update(AdminModel)
+            .where(AdminModel.id == admin.id, AdminModel.password == admin.password)
+            .values(password=hashed)
+        )
+        async with self.app.database.write_session() as session:
+            await session.execute(query)
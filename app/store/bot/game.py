@@ -0,0 +1,205 @@
+import typing
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+from uuid import UUID, uuid4
+
+from app.base.timer_wheel import Timer
+from app.game.models import EVENT_ANSWER, EVENT_SKIP, EVENT_TIMEOUT, Game, GameEvent
+from app.quiz.models import Question, Theme
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+HELP_TEXT = (
+    "Команды:\n"
+    "/start [тема] — начать игру\n"
+    "/skip — пропустить вопрос\n"
+    "/score — счёт\n"
+    "/stop — закончить игру"
+)
+
+
+def parse_command(text: str) -> tuple[Optional[str], str]:
+    """Split ``"/start web"`` into ``("start", "web")``; plain text has no command."""
+    text = text.strip()
+    if not text.startswith("/"):
+        return None, text
+    command, _, args = text[1:].partition(" ")
+    return command.lower(), args.strip()
+
+
+@dataclass(slots=True)
+class GameState:
+    id: UUID
+    chat_id: int
+    questions: list[Question]
+    current: int = 0
+    scores: dict[int, int] = field(default_factory=dict)
+    timer: Optional[Timer] = None
+
+    @property
+    def question(self) -> Question:
+        return self.questions[self.current]
+
+    @property
+    def participants(self) -> set[int]:
+        return set(self.scores)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class GameEngine:
+    """Runs quiz games, one per chat, entirely in memory.
+
+    Questions and their answers are loaded when a game starts, so checking
+    an answer never touches the database; games and answers are recorded
+    through the write-behind :class:`~app.store.game.accessor.GameAccessor`.
+    Unanswered questions expire on the app's timer wheel, and the result is
+    sent through ``notify``.
+    """
+
+    def __init__(self, app: "Application", notify: Callable[[int, str], Awaitable[None]]):
+        self.app = app
+        self.notify = notify
+        self.states: dict[int, GameState] = {}
+
+    async def handle(self, chat_id: int, user_id: int, text: str) -> str:
+        command, args = parse_command(text)
+        state = self.states.get(chat_id)
+        if command == "start":
+            return await self.start(chat_id, args)
+        if command in ("skip", "score", "stop") and state is None:
+            return "Игра не идёт.\n\n" + HELP_TEXT
+        if command == "skip":
+            return self.skip(state, user_id)
+        if command == "score":
+            return self._format_scores(state)
+        if command == "stop":
+            return self.finish(state)
+        if command is None and state is not None:
+            return self.answer(state, user_id, args)
+        return HELP_TEXT
+
+    async def start(self, chat_id: int, theme_title: str) -> str:
+        if chat_id in self.states:
+            return "Игра уже идёт.\n\n" + self._format_question(self.states[chat_id])
+        theme: Optional[Theme] = None
+        if theme_title:
+            theme = await self.app.store.quizzes.get_theme_by_title(theme_title)
+            if theme is None:
+                return f"Темы «{theme_title}» нет."
+        quizzes = self.app.store.quizzes
+        sampler = await quizzes.question_sampler(theme.id if theme else None)
+        questions = await quizzes.get_questions(sampler.sample(self.app.config.game.rounds))
+        if not questions:
+            return "Вопросов пока нет."
+
+        state = GameState(id=uuid4(), chat_id=chat_id, questions=questions)
+        self.states[chat_id] = state
+        self.app.store.games.add_game(
+            Game(
+                id=state.id,
+                chat_id=chat_id,
+                theme_id=theme.id if theme else None,
+                started_at=_now(),
+            )
+        )
+        return "Игра началась!\n\n" + self._ask(state)
+
+    def answer(self, state: GameState, user_id: int, text: str) -> str:
+        answer = self._match_answer(state.question, text)
+        if answer is None:
+            return "Ответьте номером или текстом варианта."
+        state.scores.setdefault(user_id, 0)
+        if answer.is_correct:
+            state.scores[user_id] += 1
+            reply = "Верно!"
+        else:
+            reply = f"Неверно, правильный ответ: {self._correct_answer(state.question)}."
+        self._record(state, user_id, EVENT_ANSWER, answer.is_correct)
+        return reply + "\n\n" + self._next(state)
+
+    def skip(self, state: GameState, user_id: int) -> str:
+        self._record(state, user_id, EVENT_SKIP, None)
+        reply = f"Правильный ответ: {self._correct_answer(state.question)}."
+        return reply + "\n\n" + self._next(state)
+
+    def expire(self, chat_id: int, game_id: UUID, current: int) -> Optional[Awaitable[None]]:
+        state = self.states.get(chat_id)
+        # The question may have been answered or the game replaced meanwhile.
+        if state is None or state.id != game_id or state.current != current:
+            return None
+        self._record(state, chat_id, EVENT_TIMEOUT, None)
+        reply = f"Время вышло! Правильный ответ: {self._correct_answer(state.question)}."
+        return self.notify(chat_id, reply + "\n\n" + self._next(state))
+
+    def finish(self, state: GameState) -> str:
+        if state.timer:
+            state.timer.cancel()
+        del self.states[state.chat_id]
+        self.app.store.games.finish_game(state.id, _now())
+        return "Игра окончена. " + self._format_scores(state)
+
+    def _next(self, state: GameState) -> str:
+        state.current += 1
+        if state.current == len(state.questions):
+            return self.finish(state)
+        return self._ask(state)
+
+    def _ask(self, state: GameState) -> str:
+        if state.timer:
+            state.timer.cancel()
+        state.timer = self.app.store.scheduler.call_later(
+            self.app.config.game.question_timeout,
+            self.expire,
+            state.chat_id,
+            state.id,
+            state.current,
+        )
+        return self._format_question(state)
+
+    def _record(self, state: GameState, user_id: int, kind: str, is_correct: Optional[bool]):
+        self.app.store.games.add_event(
+            GameEvent(
+                game_id=state.id,
+                user_id=user_id,
+                question_id=state.question.id,
+                kind=kind,
+                is_correct=is_correct,
+                created_at=_now(),
+            )
+        )
+
+    @staticmethod
+    def _match_answer(question: Question, text: str):
+        text = text.strip().casefold()
+        if text.isdigit() and 1 <= int(text) <= len(question.answers):
+            return question.answers[int(text) - 1]
+        for answer in question.answers:
+            if answer.title.casefold() == text:
+                return answer
+        return None
+
+    @staticmethod
+    def _correct_answer(question: Question) -> str:
+        return next(
+            (answer.title for answer in question.answers if answer.is_correct), "—"
+        )
+
+    @staticmethod
+    def _format_question(state: GameState) -> str:
+        lines = [f"Вопрос {state.current + 1}/{len(state.questions)}: {state.question.title}"]
+        lines.extend(
+            f"{i}. {answer.title}" for i, answer in enumerate(state.question.answers, start=1)
+        )
+        return "\n".join(lines)
+
+    @staticmethod
+    def _format_scores(state: GameState) -> str:
+        if not state.scores:
+            return "Очков пока нет."
+        scores = sorted(state.scores.items(), key=lambda item: -item[1])
+        return "Счёт:\n" + "\n".join(f"id{user_id}: {score}" for user_id, score in scores)
@@ -1,6 +1,8 @@
+import asyncio
 import typing
 from logging import getLogger
 
+from app.store.bot.game import GameEngine
 from app.store.vk_api.dataclasses import Message, Update
 
 if typing.TYPE_CHECKING:
@@ -12,12 +14,37 @@ class BotManager:
         self.app = app
         self.bot = None
         self.logger = getLogger("handler")
+        self._semaphore = asyncio.Semaphore(app.config.bot.concurrency)
+        self.game = GameEngine(app, notify=self.send)
 
     async def handle_updates(self, updates: list[Update]):
+        # Updates of one user are handled in order, different users run
+        # concurrently (bounded by the semaphore).
+        updates_by_user: dict[int, list[Update]] = {}
         for update in updates:
-            await self.app.store.vk_api.send_message(
-                Message(
-                    user_id=update.object.user_id,
-                    text="Привет!",
-                )
-            )
+            updates_by_user.setdefault(update.object.user_id, []).append(update)
+        await asyncio.gather(
+            *(self._handle_user_updates(user_updates) for user_updates in updates_by_user.values())
+        )
+
+    async def _handle_user_updates(self, updates: list[Update]):
+        for update in updates:
+            async with self._semaphore:
+                try:
+                    await self.handle_update(update)
+                except Exception as e:
+                    self.logger.error("Exception", exc_info=e)
+
+    async def handle_update(self, update: Update):
+        if update.type != "message_new":
+            return
+        # Dialogs with the group are private, so the chat is the user.
+        text = await self.game.handle(
+            chat_id=update.object.user_id,
+            user_id=update.object.user_id,
+            text=update.object.body,
+        )
+        await self.send(update.object.user_id, text)
+
+    async def send(self, chat_id: int, text: str):
+        await self.app.store.vk_api.send_message(Message(user_id=chat_id, text=text))
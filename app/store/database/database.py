@@ -1,4 +1,7 @@
-from typing import Optional, TYPE_CHECKING
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from time import time
+from typing import AsyncIterator, Callable, Optional, TYPE_CHECKING
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
@@ -6,20 +9,183 @@ from app.store.database import db
 
 if TYPE_CHECKING:
     from app.web.app import Application
+    from app.web.config import DatabaseConfig
+
+
+class UnitOfWork:
+    """A session shared by every accessor call made within one request.
+
+    The session is opened on first use, so requests that never touch the
+    database never check out a connection.  Until the first write, reads
+    share a replica session instead, as the primary has nothing newer yet.
+    """
+
+    def __init__(self, database: "Database"):
+        self.database = database
+        self.session: Optional[AsyncSession] = None
+        self.replica: Optional[AsyncSession] = None
+        self.written = False
+        self.callbacks: list[Callable[[], None]] = []
+
+    def get_session(self) -> AsyncSession:
+        if self.session is None:
+            self.session = self.database.session()
+        return self.session
+
+    def get_read_session(self, primary: bool = False) -> AsyncSession:
+        if primary or self.session is not None or not self.database.has_replica:
+            return self.get_session()
+        if self.replica is None:
+            self.replica = self.database.replica_session()
+        return self.replica
+
+
+@asynccontextmanager
+async def _reuse(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    yield session
+
+
+_unit_of_work: ContextVar[Optional[UnitOfWork]] = ContextVar("unit_of_work", default=None)
+# When the current task, or the task that started it, last wrote.  Kept per
+# caller, so one busy writer does not send everybody's reads to the primary;
+# HTTP clients carry it between their requests, see read_your_writes_middleware.
+_last_write_at: ContextVar[float] = ContextVar("last_write_at", default=float("-inf"))
 
 
 class Database:
     def __init__(self, app: "Application"):
         self.app = app
         self._engine: Optional[AsyncEngine] = None
+        self._replica_engine: Optional[AsyncEngine] = None
         self._db: Optional[declarative_base] = None
         self.session: Optional[AsyncSession] = None
+        self.replica_session: Optional[AsyncSession] = None
+
+    @property
+    def has_replica(self) -> bool:
+        return self._replica_engine is not None
+
+    @staticmethod
+    def _create_engine(config: "DatabaseConfig") -> AsyncEngine:
+        return create_async_engine(
+            config.url,
+            echo=config.echo,
+            pool_size=config.pool.size,
+            max_overflow=config.pool.max_overflow,
+            pool_recycle=config.pool.recycle,
+            pool_pre_ping=config.pool.pre_ping,
+            pool_timeout=config.pool.timeout,
+            connect_args={"statement_cache_size": config.pool.statement_cache_size},
+        )
 
     async def connect(self, *_: list, **__: dict) -> None:
         self._db = db
-        self._engine = create_async_engine(self.app.config.database.url, echo=True)
+        config = self.app.config.database
+        self._engine = self._create_engine(config)
         self.session = sessionmaker(self._engine, class_=AsyncSession, expire_on_commit=False)
+        if config.replica:
+            self._replica_engine = self._create_engine(config.replica)
+            self.replica_session = sessionmaker(
+                self._replica_engine, class_=AsyncSession, expire_on_commit=False
+            )
+        else:
+            self.replica_session = self.session
 
     async def disconnect(self, *_: list, **__: dict) -> None:
         if self._engine:
+            self.app.logger.info("database pool stats: %s", self.pool_stats())
             await self._engine.dispose()
+        if self._replica_engine:
+            await self._replica_engine.dispose()
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[UnitOfWork]:
+        """Run the accessor calls made inside in a single transaction.
+
+        It is committed when the block exits normally and rolled back when
+        it raises.  Tasks started inside share the session, so they must not
+        use the database concurrently.
+        """
+        unit_of_work = UnitOfWork(self)
+        token = _unit_of_work.set(unit_of_work)
+        try:
+            yield unit_of_work
+            if unit_of_work.session is not None:
+                await unit_of_work.session.commit()
+        except BaseException:
+            if unit_of_work.session is not None:
+                await unit_of_work.session.rollback()
+            raise
+        finally:
+            _unit_of_work.reset(token)
+            if unit_of_work.session is not None:
+                await unit_of_work.session.close()
+            if unit_of_work.replica is not None:
+                await unit_of_work.replica.close()
+        if unit_of_work.written:
+            _last_write_at.set(time())
+        for callback in unit_of_work.callbacks:
+            callback()
+
+    def last_write_at(self) -> float:
+        """When the current caller last wrote, as a ``time.time()`` timestamp."""
+        return _last_write_at.get()
+
+    def restore_last_write_at(self, written_at: float) -> None:
+        """Take over a caller's last write from an earlier task, such as the
+        previous request of the same client.  Times ahead are clamped to now."""
+        if written_at > _last_write_at.get():
+            _last_write_at.set(min(written_at, time()))
+
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """Call ``callback`` once the current unit of work commits, or right
+        away when there is none."""
+        if (unit_of_work := _unit_of_work.get()) is not None:
+            unit_of_work.callbacks.append(callback)
+        else:
+            callback()
+
+    @asynccontextmanager
+    async def write_session(
+        self, read_your_writes: bool = True
+    ) -> AsyncIterator[AsyncSession]:
+        """Open a transaction on the primary.
+
+        With ``read_your_writes=False`` the write does not send the caller's
+        next reads to the primary, for background writers that never read
+        back what they wrote.
+        """
+        if (unit_of_work := _unit_of_work.get()) is not None:
+            # A savepoint, so a failed write the caller handles does not
+            # abort the rest of the unit of work.
+            session = unit_of_work.get_session()
+            async with session.begin_nested():
+                yield session
+            unit_of_work.written = unit_of_work.written or read_your_writes
+            return
+        async with self.session.begin() as session:
+            yield session
+        if read_your_writes:
+            _last_write_at.set(time())
+
+    def read_session(self, primary: bool = False):
+        # Reads issued shortly after the caller's own write go to the primary,
+        # so that replication lag never hides data it has just created.  Other
+        # tasks do not see the write; they pass ``primary=True`` when needed.
+        primary = primary or (
+            time() - _last_write_at.get() < self.app.config.database.read_your_writes
+        )
+        if (unit_of_work := _unit_of_work.get()) is not None:
+            return _reuse(unit_of_work.get_read_session(primary))
+        if primary:
+            return self.session.begin()
+        return self.replica_session.begin()
+
+    def pool_stats(self) -> dict:
+        pool = self._engine.pool
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        }
@@ -0,0 +1,215 @@
+import asyncio
+import typing
+from asyncio import Task
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.base.base_accessor import BaseAccessor
+from app.game.models import Game, GameEvent, GameEventModel, GameModel
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+# Errors after which the same records may well be written on the next try.
+RECOVERABLE_ERRORS = (
+    OSError,
+    asyncio.TimeoutError,
+    OperationalError,
+    InterfaceError,
+    PoolTimeoutError,
+)
+
+
+class GameAccessor(BaseAccessor):
+    """Stores games and their events with write-behind batching.
+
+    ``add_game``, ``finish_game`` and ``add_event`` only queue a record and
+    never wait on Postgres.  A background task writes the queued records in
+    one transaction every ``game.flush_interval`` seconds, or sooner once
+    ``game.flush_size`` records are pending.  A flush that fails on a lost
+    connection or a timeout keeps its records for the next one; past
+    ``game.max_pending`` the oldest events are dropped.  A batch rejected
+    for any other reason is retried record by record, and the records
+    Postgres still rejects are logged and discarded.
+    """
+
+    def __init__(self, app: "Application", *args, **kwargs):
+        super().__init__(app, *args, **kwargs)
+        self.pending_games: list[dict] = []
+        self.pending_finishes: list[dict] = []
+        self.pending_events: list[dict] = []
+        self.flushed = 0
+        self.dropped = 0
+        self.rejected = 0
+        self._wakeup = asyncio.Event()
+        self._flush_task: Optional[Task] = None
+        self._lock = asyncio.Lock()
+
+    async def connect(self, app: "Application"):
+        self._flush_task = asyncio.create_task(self._flush_periodically())
+
+    async def disconnect(self, app: "Application"):
+        if self._flush_task:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        await self.flush()
+        self.logger.info("game writer stats: %s", self.stats())
+
+    def add_game(self, game: Game) -> None:
+        self.pending_games.append(
+            {
+                "id": game.id,
+                "chat_id": game.chat_id,
+                "theme_id": game.theme_id,
+                "started_at": game.started_at,
+            }
+        )
+        self._queued()
+
+    def finish_game(self, game_id: UUID, finished_at: datetime) -> None:
+        self.pending_finishes.append({"game_id": game_id, "game_finished_at": finished_at})
+        self._queued()
+
+    def add_event(self, event: GameEvent) -> None:
+        self.pending_events.append(
+            {
+                "game_id": event.game_id,
+                "user_id": event.user_id,
+                "question_id": event.question_id,
+                "kind": event.kind,
+                "is_correct": event.is_correct,
+                "created_at": event.created_at,
+            }
+        )
+        self._queued()
+
+    def pending(self) -> int:
+        return len(self.pending_games) + len(self.pending_finishes) + len(self.pending_events)
+
+    def _queued(self):
+        if self.pending() >= self.app.config.game.flush_size:
+            self._wakeup.set()
+
+    async def _flush_periodically(self):
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self.app.config.game.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._lock:
+            games, self.pending_games = self.pending_games, []
+            finishes, self.pending_finishes = self.pending_finishes, []
+            events, self.pending_events = self.pending_events, []
+            if not (games or finishes or events):
+                return
+            try:
+                await self._write(games, events, finishes)
+            except RECOVERABLE_ERRORS as e:
+                self.logger.error("failed to flush game records", exc_info=e)
+                self._requeue(games, events, finishes)
+                return
+            except Exception as e:
+                self.logger.warning("game records rejected, retrying one by one: %s", e)
+                await self._write_one_by_one(games, events, finishes)
+                return
+            self.flushed += len(games) + len(finishes) + len(events)
+
+    async def _write(self, games: list[dict], events: list[dict], finishes: list[dict]):
+        # Nothing reads these back soon, so keep the bot's reads on the replica.
+        async with self.app.database.write_session(read_your_writes=False) as session:
+            if games:
+                await session.execute(insert(GameModel), games)
+            if events:
+                await session.execute(insert(GameEventModel), events)
+            if finishes:
+                table = GameModel.__table__
+                await session.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("game_id"))
+                    .values(finished_at=bindparam("game_finished_at")),
+                    finishes,
+                )
+
+    async def _write_one_by_one(
+        self, games: list[dict], events: list[dict], finishes: list[dict]
+    ):
+        # Games first, so that the events and finishes referencing them
+        # are written after them.
+        records = [
+            *(([game], [], []) for game in games),
+            *(([], [event], []) for event in events),
+            *(([], [], [finish]) for finish in finishes),
+        ]
+        for i, record in enumerate(records):
+            try:
+                await self._write(*record)
+            except RECOVERABLE_ERRORS as e:
+                self.logger.error("failed to flush game records", exc_info=e)
+                rest = records[i:]
+                self._requeue(
+                    [game for part, _, _ in rest for game in part],
+                    [event for _, part, _ in rest for event in part],
+                    [finish for _, _, part in rest for finish in part],
+                )
+                return
+            except Exception as e:
+                self.rejected += 1
+                self.logger.error("discarded game record %s: %s", record, e)
+            else:
+                self.flushed += 1
+
+    def _requeue(self, games: list[dict], events: list[dict], finishes: list[dict]):
+        self.pending_games[:0] = games
+        self.pending_finishes[:0] = finishes
+        self.pending_events[:0] = events
+        self._drop_overflow()
+
+    def _drop_overflow(self):
+        overflow = self.pending() - self.app.config.game.max_pending
+        if overflow > 0:
+            dropped = min(overflow, len(self.pending_events))
+            del self.pending_events[:dropped]
+            self.dropped += dropped
+            self.logger.warning("dropped %d game events", dropped)
+
+    def discard(self) -> None:
+        self.pending_games.clear()
+        self.pending_finishes.clear()
+        self.pending_events.clear()
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending(),
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+        }
+
+    async def get_game(self, id_: UUID) -> Game | None:
+        query = select(GameModel).where(GameModel.id == id_)
+        async with self.app.database.read_session() as session:
+            game = (await session.scalars(query)).first()
+        if not game:
+            return None
+        return game.dataclass
+
+    async def list_events(self, game_id: UUID) -> list[GameEvent]:
+        query = (
+            select(GameEventModel)
+            .where(GameEventModel.game_id == game_id)
+            .order_by(GameEventModel.id)
+        )
+        async with self.app.database.read_session() as session:
+            return [event.dataclass for event in await session.scalars(query)]
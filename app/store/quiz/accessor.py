@@ -1,7 +1,17 @@
-from sqlalchemy import select
+import asyncio
+import typing
+from functools import partial
+from time import monotonic
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import func, insert, literal_column, select
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, joinedload
 
 from app.base.base_accessor import BaseAccessor
+from app.base.cache import TTLCache
+from app.store.quiz.sampler import QuestionSampler
 from app.quiz.models import (
     Answer,
     Question,
@@ -10,65 +20,377 @@ from app.quiz.models import (
     QuestionModel, AnswerModel,
 )
 
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+STREAM_CHUNK_SIZE = 500
+
+JOINED_LOADER = "joined"
+SELECTIN_LOADER = "selectin"
+JSON_LOADER = "json"
+QUESTION_LOADERS = (JOINED_LOADER, SELECTIN_LOADER, JSON_LOADER)
+DEFAULT_QUESTION_LOADER = JSON_LOADER
+
 
 class QuizAccessor(BaseAccessor):
+    def __init__(self, app: "Application", *args, **kwargs):
+        super().__init__(app, *args, **kwargs)
+        self.cache = TTLCache(
+            maxsize=app.config.cache.maxsize, ttl=app.config.cache.ttl
+        )
+        # Question ids by theme, and all of them, for random selection.
+        self.question_ids: dict[int, list[int]] = {}
+        self.all_question_ids: list[int] = []
+        # When the cache was last invalidated: reads that refill it go to the
+        # primary for a while after, so a lagging replica's rows are never
+        # cached, whoever made the write.
+        self._invalidated_at = float("-inf")
+        self._index_ready = False
+        # Questions committed while the index is being built.
+        self._index_pending: Optional[list[tuple[int, int]]] = None
+        self._index_lock = asyncio.Lock()
+
+    async def connect(self, app: "Application"):
+        await self._ensure_question_index()
+
+    async def disconnect(self, app: "Application"):
+        self.logger.info("quiz cache stats: %s", self.cache.stats())
+
+    def _invalidate(self, *prefix):
+        # Again once the request's unit of work commits, so that a read
+        # made meanwhile by another request can't cache the old rows.
+        self._drop_cached(prefix)
+        self.app.database.on_commit(partial(self._drop_cached, prefix))
+
+    def _drop_cached(self, prefix: tuple):
+        self.cache.invalidate(*prefix)
+        self._invalidated_at = monotonic()
+
+    def _refill_session(self):
+        """A read session for rows that are about to be cached."""
+        recently_invalidated = (
+            monotonic() - self._invalidated_at < self.app.config.database.read_your_writes
+        )
+        return self.app.database.read_session(primary=recently_invalidated)
+
+    def _cache_set(self, key: tuple, value):
+        # Rows read inside a unit of work may not be committed yet; they are
+        # cached only once it commits, and never if it rolls back.
+        self.app.database.on_commit(partial(self.cache.set, key, value))
+
     async def create_theme(self, title: str) -> Theme:
         theme = ThemeModel(title=title)
-        async with self.app.database.session.begin() as session:
+        async with self.app.database.write_session() as session:
             session.add(theme)
-            await session.commit()
+        self._invalidate("themes")
         return theme.dataclass
 
+    async def create_themes(self, titles: list[str]) -> list[Theme]:
+        """Insert themes in one statement, skipping titles that already exist."""
+        if not titles:
+            return []
+        query = (
+            pg_insert(ThemeModel)
+            .values([{"title": title} for title in titles])
+            .on_conflict_do_nothing(index_elements=[ThemeModel.title])
+            .returning(ThemeModel.id, ThemeModel.title)
+        )
+        async with self.app.database.write_session() as session:
+            themes = [Theme(id=id_, title=title) for id_, title in await session.execute(query)]
+        if themes:
+            self._invalidate("themes")
+        return themes
+
     async def get_theme_by_title(self, title: str) -> Theme | None:
         query = select(ThemeModel).where(ThemeModel.title == title)
-        async with self.app.database.session.begin() as session:
+        async with self.app.database.read_session() as session:
             theme = (await session.scalars(query)).first()
         if not theme:
             return None
         return theme.dataclass
 
     async def get_theme_by_id(self, id_: int) -> Theme | None:
+        if cached := self.cache.get(("theme", id_)):
+            return cached
         query = select(ThemeModel).where(ThemeModel.id == id_)
-        async with self.app.database.session.begin() as session:
+        async with self._refill_session() as session:
             theme = (await session.scalars(query)).first()
         if not theme:
             return None
+        self._cache_set(("theme", id_), theme.dataclass)
         return theme.dataclass
 
-    async def list_themes(self) -> list[Theme]:
-        async with self.app.database.session.begin() as session:
-            themes = await session.scalars(select(ThemeModel))
-        return [theme.dataclass for theme in themes]
+    async def get_existing_theme_ids(self, ids: set[int]) -> set[int]:
+        if not ids:
+            return set()
+        query = select(ThemeModel.id).where(ThemeModel.id.in_(ids))
+        async with self.app.database.read_session() as session:
+            return set(await session.scalars(query))
 
-    async def create_answers(self, question_id: int, answers: list[Answer]) -> list[AnswerModel]:
-        answers_ = []
-        for answer in answers:
-            answer_ = AnswerModel(title=answer.title, is_correct=answer.is_correct, question_id=question_id)
-            answers_.append(answer_)
-        return answers_
+    async def list_themes(self) -> list[Theme]:
+        if (cached := self.cache.get(("themes",))) is not None:
+            return list(cached)
+        async with self._refill_session() as session:
+            themes = [theme.dataclass for theme in await session.scalars(select(ThemeModel))]
+        self._cache_set(("themes",), themes)
+        return list(themes)
 
     async def create_question(self, title: str, theme_id: int, answers: list[Answer]) -> Question:
-        question = QuestionModel(title=title, theme_id=theme_id)
-        async with self.app.database.session.begin() as session:
-            session.add(question)
-            await session.flush()
-            answers_ = await self.create_answers(question.id, answers)
-            session.add_all(answers_)
-            await session.commit()
-        return await self.get_question_by_title(question.title)
-
-    async def get_question_by_title(self, title: str) -> Question | None:
-        query = select(QuestionModel).options(joinedload(QuestionModel.answers)).where(QuestionModel.title == title)
-        async with self.app.database.session.begin() as session:
-            question = (await session.scalars(query)).first()
-        if not question:
+        async with self.app.database.write_session() as session:
+            question_id = await session.scalar(
+                insert(QuestionModel)
+                .values(title=title, theme_id=theme_id)
+                .returning(QuestionModel.id)
+            )
+            created_answers = []
+            if answers:
+                created_answers = await session.execute(
+                    insert(AnswerModel)
+                    .values(
+                        [
+                            {
+                                "title": answer.title,
+                                "is_correct": answer.is_correct,
+                                "question_id": question_id,
+                            }
+                            for answer in answers
+                        ]
+                    )
+                    .returning(AnswerModel.title, AnswerModel.is_correct)
+                )
+        self._invalidate("questions", None)
+        self._invalidate("questions", theme_id)
+        self.app.database.on_commit(
+            partial(self._index_questions, [(question_id, theme_id)])
+        )
+        return Question(
+            id=question_id,
+            title=title,
+            theme_id=theme_id,
+            answers=[
+                Answer(title=answer_title, is_correct=is_correct)
+                for answer_title, is_correct in created_answers
+            ],
+        )
+
+    async def create_questions(self, questions: list[Question]) -> list[Question | None]:
+        """Insert questions in bulk, skipping the ones whose title is taken.
+
+        The result is aligned with ``questions``: skipped questions, including
+        repeated titles within the batch, are returned as ``None``.
+        """
+        if not questions:
+            return []
+        async with self.app.database.write_session() as session:
+            rows = await session.execute(
+                pg_insert(QuestionModel)
+                .on_conflict_do_nothing(index_elements=[QuestionModel.title])
+                .returning(QuestionModel.id, QuestionModel.title),
+                [
+                    {"title": question.title, "theme_id": question.theme_id}
+                    for question in questions
+                ],
+            )
+            ids = {title: id_ for id_, title in rows}
+
+            created: list[Question | None] = []
+            for question in questions:
+                if (id_ := ids.pop(question.title, None)) is None:
+                    created.append(None)
+                    continue
+                created.append(
+                    Question(
+                        id=id_,
+                        title=question.title,
+                        theme_id=question.theme_id,
+                        answers=question.answers,
+                    )
+                )
+
+            answers = [
+                {
+                    "title": answer.title,
+                    "is_correct": answer.is_correct,
+                    "question_id": question.id,
+                }
+                for question in created
+                if question
+                for answer in question.answers
+            ]
+            if answers:
+                await session.execute(insert(AnswerModel), answers)
+        self._invalidate("questions")
+        self.app.database.on_commit(
+            partial(
+                self._index_questions,
+                [(question.id, question.theme_id) for question in created if question],
+            )
+        )
+        return created
+
+    async def get_question_by_title(
+        self, title: str, primary: bool = False, loader: str = DEFAULT_QUESTION_LOADER
+    ) -> Question | None:
+        query = select(QuestionModel).where(QuestionModel.title == title)
+        async with self.app.database.read_session(primary=primary) as session:
+            questions = await self._fetch_questions(session, query, loader)
+        if not questions:
             return None
-        return question.dataclass
+        return questions[0]
 
-    async def list_questions(self, theme_id: int | None = None) -> list[Question]:
-        query = select(QuestionModel).options(joinedload(QuestionModel.answers))
-        if theme_id:
-            query = query.where(QuestionModel.theme_id == theme_id)
-        async with self.app.database.session.begin() as session:
+    @staticmethod
+    def _answers_json():
+        answer = func.json_build_object(
+            "title", AnswerModel.title, "is_correct", AnswerModel.is_correct
+        )
+        return func.coalesce(
+            func.json_agg(aggregate_order_by(answer, AnswerModel.id)).filter(
+                AnswerModel.id.is_not(None)
+            ),
+            literal_column("'[]'::json"),
+            type_=JSON,
+        )
+
+    async def _fetch_questions(
+        self, session: AsyncSession, query, loader: str
+    ) -> list[Question]:
+        if loader == JSON_LOADER:
+            query = (
+                query.with_only_columns(
+                    QuestionModel.id,
+                    QuestionModel.title,
+                    QuestionModel.theme_id,
+                    self._answers_json(),
+                )
+                .outerjoin(AnswerModel)
+                .group_by(QuestionModel.id)
+            )
+            return [
+                Question(
+                    id=id_,
+                    title=title,
+                    theme_id=theme_id,
+                    answers=[Answer(**answer) for answer in answers],
+                )
+                for id_, title, theme_id, answers in await session.execute(query)
+            ]
+        if loader == JOINED_LOADER:
+            query = query.options(joinedload(QuestionModel.answers))
             questions = (await session.scalars(query)).unique()
+        elif loader == SELECTIN_LOADER:
+            query = query.options(selectinload(QuestionModel.answers))
+            questions = await session.scalars(query)
+        else:
+            raise ValueError(f"unknown question loader: {loader}")
         return [question.dataclass for question in questions]
+
+    @staticmethod
+    def _questions_query(
+        theme_id: int | None = None,
+        limit: int | None = None,
+        after_id: int | None = None,
+    ):
+        query = select(QuestionModel).order_by(QuestionModel.id)
+        if theme_id:
+            query = query.where(QuestionModel.theme_id == theme_id)
+        if after_id is not None:
+            query = query.where(QuestionModel.id > after_id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
+    async def list_questions(
+        self,
+        theme_id: int | None = None,
+        limit: int | None = None,
+        after_id: int | None = None,
+        loader: str = DEFAULT_QUESTION_LOADER,
+    ) -> list[Question]:
+        key = ("questions", theme_id or None, limit, after_id)
+        if (cached := self.cache.get(key)) is not None:
+            return list(cached)
+        query = self._questions_query(theme_id, limit, after_id)
+        async with self._refill_session() as session:
+            questions = await self._fetch_questions(session, query, loader)
+        self._cache_set(key, questions)
+        return list(questions)
+
+    async def stream_questions(
+        self,
+        theme_id: int | None = None,
+        limit: int | None = None,
+        after_id: int | None = None,
+    ) -> AsyncIterator[Question]:
+        query = (
+            self._questions_query(theme_id, limit, after_id)
+            .options(selectinload(QuestionModel.answers))
+            .execution_options(yield_per=STREAM_CHUNK_SIZE)
+        )
+        async with self.app.database.read_session() as session:
+            async for question in await session.stream_scalars(query):
+                yield question.dataclass
+
+    async def _ensure_question_index(self):
+        if self._index_ready:
+            return
+        async with self._index_lock:
+            if self._index_ready:
+                return
+            query = select(QuestionModel.id, QuestionModel.theme_id).order_by(
+                QuestionModel.id
+            )
+            # The query may or may not see questions committed while it runs,
+            # so they are collected meanwhile and merged in without repeats.
+            self._index_pending = []
+            try:
+                async with self.app.database.read_session(primary=True) as session:
+                    rows = (await session.execute(query)).all()
+            finally:
+                pending, self._index_pending = self._index_pending or [], None
+            self.reset_question_index()
+            self._index_ready = True
+            seen = {id_ for id_, _ in rows}
+            self._index_questions(
+                [*rows, *(row for row in dict(pending).items() if row[0] not in seen)]
+            )
+
+    def _index_questions(self, questions: list[tuple[int, int]]):
+        if self._index_pending is not None:
+            self._index_pending.extend(questions)
+            return
+        # Before the index is built, its query picks new questions up.
+        if not self._index_ready:
+            return
+        for id_, theme_id in questions:
+            self.question_ids.setdefault(theme_id, []).append(id_)
+            self.all_question_ids.append(id_)
+
+    def reset_question_index(self):
+        self.question_ids = {}
+        self.all_question_ids = []
+        self._index_ready = False
+
+    async def question_sampler(self, theme_id: int | None = None) -> QuestionSampler:
+        """Return a sampler of random question ids, of one theme or of all.
+
+        Each game should use its own sampler, so it never repeats a question.
+        """
+        await self._ensure_question_index()
+        if theme_id is None:
+            return QuestionSampler(self.all_question_ids)
+        return QuestionSampler(self.question_ids.setdefault(theme_id, []))
+
+    async def get_questions(self, ids: list[int]) -> list[Question]:
+        """Return the questions with their answers, in the order of ``ids``.
+
+        Questions are cached by id; the ones missing from the cache are
+        loaded in one query.  Unknown ids are skipped.
+        """
+        questions = {id_: self.cache.get(("question", id_)) for id_ in ids}
+        if missing := [id_ for id_, question in questions.items() if question is None]:
+            query = select(QuestionModel).where(QuestionModel.id.in_(missing))
+            async with self._refill_session() as session:
+                for question in await self._fetch_questions(session, query, JSON_LOADER):
+                    self._cache_set(("question", question.id), question)
+                    questions[question.id] = question
+        return [questions[id_] for id_ in ids if questions[id_] is not None]
@@ -0,0 +1,34 @@
+import random
+from typing import Optional
+
+
+class QuestionSampler:
+    """Draws question ids uniformly at random, without replacement.
+
+    A lazy Fisher-Yates shuffle over ``ids``: every draw is O(1) and only
+    the swapped positions are remembered, so the shared id list is neither
+    copied nor changed.  Ids appended to the list later can still be drawn.
+    """
+
+    def __init__(self, ids: list[int]):
+        self.ids = ids
+        self.drawn = 0
+        self._swaps: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids) - self.drawn
+
+    def draw(self) -> Optional[int]:
+        if not len(self):
+            return None
+        i = self.drawn
+        j = random.randrange(i, len(self.ids))
+        picked = self._swaps.get(j, j)
+        if j != i:
+            self._swaps[j] = self._swaps.get(i, i)
+        self._swaps.pop(i, None)
+        self.drawn += 1
+        return self.ids[picked]
+
+    def sample(self, k: int) -> list[int]:
+        return [self.draw() for _ in range(min(k, len(self)))]
@@ -0,0 +1,27 @@
+import typing
+from typing import Any, Callable
+
+from app.base.base_accessor import BaseAccessor
+from app.base.timer_wheel import Timer, TimerWheel
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+
+class SchedulerAccessor(BaseAccessor):
+    """Runs delayed callbacks, such as question deadlines, on one timer wheel."""
+
+    def __init__(self, app: "Application", *args, **kwargs):
+        super().__init__(app, *args, **kwargs)
+        self.wheel = TimerWheel(
+            tick=app.config.scheduler.tick, slots=app.config.scheduler.slots
+        )
+
+    async def connect(self, app: "Application"):
+        self.wheel.start()
+
+    async def disconnect(self, app: "Application"):
+        await self.wheel.stop()
+
+    def call_later(self, delay: float, callback: Callable[..., Any], *args: Any) -> Timer:
+        return self.wheel.call_later(delay, callback, *args)
@@ -1,115 +1,312 @@
+import asyncio
 import random
 import typing
-from typing import Optional
+from functools import partial
+from time import monotonic
+from typing import Any, Optional
 
-from aiohttp import TCPConnector
+from aiohttp import ClientError, ClientTimeout, TCPConnector
 from aiohttp.client import ClientSession
 
 from app.base.base_accessor import BaseAccessor
-from app.store.vk_api.dataclasses import Message, Update, UpdateObject
+from app.base.json_backend import dumps, loads
+from app.base.metrics import Histogram
+from app.store.vk_api.batcher import MessageBatcher
+from app.store.vk_api.dataclasses import Message, Update
 from app.store.vk_api.poller import Poller
+from app.store.vk_api.rate_limiter import PRIORITY_HIGH, PRIORITY_LOW, RateLimiter
 
 if typing.TYPE_CHECKING:
     from app.web.app import Application
 
-API_PATH = "https://api.vk.com/method/"
+API_VERSION = "5.131"
+
+# Too many requests per second, flood control, internal server error.
+RETRYABLE_ERROR_CODES = {6, 9, 10}
+
+MAX_BACKOFF = 30.0
+LONG_POLL_WAIT = 30
+LONG_POLL_CONNECTIONS = 1
+POLL_LATENCY_BUCKETS = (0.1, 0.5, 1, 5, 10, 25, LONG_POLL_WAIT, LONG_POLL_WAIT + 5)
+
+# Long poll "failed" codes: history is outdated (take the new ts), key has
+# expired (take a new key), information is lost (take a new key and ts).
+LONG_POLL_OUTDATED_TS = 1
+LONG_POLL_KEY_EXPIRED = 2
+LONG_POLL_INFO_LOST = 3
+
+
+class VkApiError(Exception):
+    def __init__(self, code: Optional[int], message: Optional[str]):
+        super().__init__(f"VK API error {code}: {message}")
+        self.code = code
+        self.message = message
+
+    @property
+    def is_retryable(self) -> bool:
+        return self.code in RETRYABLE_ERROR_CODES
 
 
 class VkApiAccessor(BaseAccessor):
     def __init__(self, app: "Application", *args, **kwargs):
         super().__init__(app, *args, **kwargs)
         self.session: Optional[ClientSession] = None
+        self.long_poll_session: Optional[ClientSession] = None
         self.key: Optional[str] = None
         self.server: Optional[str] = None
         self.poller: Optional[Poller] = None
         self.ts: Optional[int] = None
+        self.poll_failures = 0
+        self.reconnects = 0
+        self.skipped_updates = 0
+        self.poll_latency = Histogram(POLL_LATENCY_BUCKETS)
+        self.rate_limiter = RateLimiter(app.config.bot.rate_limit)
+        # Params shared by every call are built once instead of per request.
+        self._static_params = {
+            "access_token": app.config.bot.token,
+            "v": API_VERSION,
+        }
+        self._peer_id = "-" + str(app.config.bot.group_id)
+        self.batchers = {
+            priority: MessageBatcher(
+                partial(self._send_messages, priority=priority),
+                window=app.config.bot.send_window,
+            )
+            for priority in (PRIORITY_HIGH, PRIORITY_LOW)
+        }
+
+    def _create_session(self, limit: int, timeout: ClientTimeout) -> ClientSession:
+        config = self.app.config.bot
+        return ClientSession(
+            connector=TCPConnector(
+                ssl=False,
+                limit=limit,
+                limit_per_host=min(limit, config.connection_limit_per_host),
+                keepalive_timeout=config.keepalive_timeout,
+                ttl_dns_cache=config.dns_cache_ttl,
+            ),
+            timeout=timeout,
+        )
+
+    def _open_sessions(self):
+        # Method calls and long polling get separate connection pools, so a
+        # hanging long poll request never holds a connection sends need.
+        config = self.app.config.bot
+        self.session = self._create_session(
+            limit=config.connection_limit,
+            timeout=ClientTimeout(
+                total=config.request_timeout, sock_connect=config.connect_timeout
+            ),
+        )
+        self.long_poll_session = self._create_session(
+            limit=LONG_POLL_CONNECTIONS,
+            timeout=ClientTimeout(
+                total=LONG_POLL_WAIT + config.request_timeout,
+                sock_connect=config.connect_timeout,
+                sock_read=LONG_POLL_WAIT + config.connect_timeout,
+            ),
+        )
 
     async def connect(self, app: "Application"):
-        self.session = ClientSession(connector=TCPConnector(verify_ssl=False))
+        self._open_sessions()
         try:
             await self._get_long_poll_service()
         except Exception as e:
             self.logger.error("Exception", exc_info=e)
-        self.poller = Poller(app.store)
+        self.poller = Poller(
+            app.store,
+            queue_size=app.config.bot.queue_size,
+            workers=app.config.bot.workers,
+        )
         self.logger.info("start polling")
         await self.poller.start()
 
     async def disconnect(self, app: "Application"):
-        if self.session:
-            await self.session.close()
         if self.poller:
             await self.poller.stop()
+            self.logger.info("poller stats: %s", self.poller.stats())
+            self.logger.info("long poll stats: %s", self.poll_stats())
+        for batcher in self.batchers.values():
+            await batcher.close()
+        if self.session:
+            await self.session.close()
+        if self.long_poll_session:
+            await self.long_poll_session.close()
 
-    @staticmethod
-    def _build_query(host: str, method: str, params: dict) -> str:
-        url = host + method + "?"
-        if "v" not in params:
-            params["v"] = "5.131"
-        url += "&".join([f"{k}={v}" for k, v in params.items()])
-        return url
-
-    async def _get_long_poll_service(self):
-        async with self.session.get(
-            self._build_query(
-                host=API_PATH,
-                method="groups.getLongPollServer",
-                params={
-                    "group_id": self.app.config.bot.group_id,
-                    "access_token": self.app.config.bot.token,
-                },
+    def _build_request(self, method: str, params: dict) -> tuple[str, dict]:
+        """Return the url and the form body of a VK method call.
+
+        The caller's ``params`` are left untouched; the access token and the
+        API version go to the POST body rather than the url.
+        """
+        return self.app.config.bot.api_path + method, {**params, **self._static_params}
+
+    def _backoff(self, attempt: int) -> float:
+        # Exponential backoff with full jitter.
+        return random.uniform(
+            0, min(MAX_BACKOFF, self.app.config.bot.retry_backoff * 2**attempt)
+        )
+
+    async def _call_method(
+        self, method: str, params: dict, priority: int = PRIORITY_HIGH
+    ) -> dict:
+        """Call a VK API method, retrying throttling and transient failures.
+
+        Returns the whole response body; a non-retryable ``error`` in it is
+        raised as :class:`VkApiError`.
+        """
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire(priority)
+            url, body = self._build_request(method, params)
+            try:
+                async with self.session.post(url, data=body) as resp:
+                    data = await resp.json(loads=loads)
+                if "error" in data:
+                    raise VkApiError(
+                        data["error"].get("error_code"), data["error"].get("error_msg")
+                    )
+                return data
+            except (VkApiError, ClientError, asyncio.TimeoutError) as e:
+                retryable = not isinstance(e, VkApiError) or e.is_retryable
+                if not retryable or attempt >= self.app.config.bot.max_retries:
+                    raise
+                self.logger.warning("%s failed, retrying: %s", method, e)
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+
+    async def _get_long_poll_service(self, update_ts: bool = True):
+        data = (
+            await self._call_method(
+                "groups.getLongPollServer",
+                params={"group_id": self.app.config.bot.group_id},
             )
-        ) as resp:
-            data = (await resp.json())["response"]
-            self.logger.info(data)
-            self.key = data["key"]
-            self.server = data["server"]
+        )["response"]
+        self.logger.info(data)
+        self.key = data["key"]
+        self.server = data["server"]
+        if update_ts or self.ts is None:
             self.ts = data["ts"]
-            self.logger.info(self.server)
+        self.logger.info(self.server)
+
+    async def poll(self) -> list[Update]:
+        """Fetch the next batch of updates.
 
-    async def poll(self):
-        async with self.session.get(
-            self._build_query(
-                host=self.server,
-                method="",
+        Never raises on VK or network failures: the long poll session is
+        refreshed or retried with backoff and an empty batch is returned, so
+        the poller simply calls again.  Updates without a message are skipped.
+        """
+        try:
+            if self.server is None:
+                await self._get_long_poll_service()
+            started = monotonic()
+            async with self.long_poll_session.get(
+                self.server,
                 params={
                     "act": "a_check",
                     "key": self.key,
                     "ts": self.ts,
-                    "wait": 30,
+                    "wait": LONG_POLL_WAIT,
                 },
-            )
-        ) as resp:
-            data = await resp.json()
+            ) as resp:
+                data = await resp.json(loads=loads)
+            self.poll_latency.observe(monotonic() - started)
             self.logger.info(data)
+
+            if failed := data.get("failed"):
+                await self._recover(failed, data)
+                return []
             self.ts = data["ts"]
-            raw_updates = data.get("updates", [])
-            updates = []
-            for update in raw_updates:
-                updates.append(
-                    Update(
-                        type=update["type"],
-                        object=UpdateObject(
-                            id=update["object"]["id"],
-                            user_id=update["object"]["user_id"],
-                            body=update["object"]["body"],
-                        ),
-                    )
-                )
-            await self.app.store.bots_manager.handle_updates(updates)
-
-    async def send_message(self, message: Message) -> None:
-        async with self.session.get(
-            self._build_query(
-                API_PATH,
-                "messages.send",
-                params={
-                    "user_id": message.user_id,
-                    "random_id": random.randint(1, 2**32),
-                    "peer_id": "-" + str(self.app.config.bot.group_id),
-                    "message": message.text,
-                    "access_token": self.app.config.bot.token,
-                },
-            )
-        ) as resp:
-            data = await resp.json()
-            self.logger.info(data)
+        except (VkApiError, ClientError, asyncio.TimeoutError, ValueError, KeyError) as e:
+            self.logger.warning("long poll failed: %r", e)
+            await asyncio.sleep(self._backoff(self.poll_failures))
+            self.poll_failures += 1
+            return []
+
+        self.poll_failures = 0
+        updates = []
+        for raw in data.get("updates", []):
+            try:
+                updates.append(Update.from_dict(raw))
+            except (KeyError, TypeError) as e:
+                # Events other than messages, such as group_join, lack the
+                # message fields; one of them must not stop polling.
+                self.skipped_updates += 1
+                self.logger.info("skipped update %r: %r", raw, e)
+        return updates
+
+    async def _recover(self, failed: int, data: dict):
+        if failed == LONG_POLL_OUTDATED_TS:
+            self.ts = data["ts"]
+            return
+        self.reconnects += 1
+        await self._get_long_poll_service(update_ts=failed != LONG_POLL_KEY_EXPIRED)
+
+    def stats(self) -> dict:
+        """Runtime stats of the bot's update ingestion, for /admin.bot_stats."""
+        return {
+            "poller": self.poller.stats() if self.poller else None,
+            "long_poll": self.poll_stats(),
+        }
+
+    def poll_stats(self) -> dict:
+        return {
+            "reconnects": self.reconnects,
+            "consecutive_failures": self.poll_failures,
+            "skipped_updates": self.skipped_updates,
+            "latency": self.poll_latency.stats(),
+        }
+
+    async def send_message(self, message: Message, priority: int = PRIORITY_HIGH) -> None:
+        """Send a message; game replies should keep the default high priority,
+        bulk notifications should pass ``PRIORITY_LOW``."""
+        await self.batchers[priority].send(message)
+
+    def _message_params(self, message: Message) -> dict:
+        return {
+            "user_id": message.user_id,
+            "random_id": random.randint(1, 2**31 - 1),
+            "peer_id": self._peer_id,
+            "message": message.text,
+        }
+
+    async def _execute_messages(self, messages: list[Message], priority: int) -> list[Any]:
+        # Up to 25 API calls fit into one execute request; a failed call
+        # yields false in the response and an entry in execute_errors.
+        calls = ",".join(
+            f"API.messages.send({dumps(self._message_params(message))})"
+            for message in messages
+        )
+        data = await self._call_method(
+            "execute", params={"code": f"return [{calls}];"}, priority=priority
+        )
+        self.logger.info(data)
+
+        errors = iter(data.get("execute_errors", []))
+        results = []
+        for result in data["response"]:
+            if result is False:
+                error = next(errors, {})
+                result = VkApiError(error.get("error_code"), error.get("error_msg"))
+            results.append(result)
+        return results
+
+    async def _send_messages(
+        self, messages: list[Message], priority: int = PRIORITY_HIGH
+    ) -> list[Any]:
+        results: list[Any] = [None] * len(messages)
+        pending = list(range(len(messages)))
+        attempt = 0
+        while True:
+            sent = await self._execute_messages([messages[i] for i in pending], priority)
+            for i, result in zip(pending, sent):
+                results[i] = result
+            pending = [
+                i
+                for i in pending
+                if isinstance(results[i], VkApiError) and results[i].is_retryable
+            ]
+            if not pending or attempt >= self.app.config.bot.max_retries:
+                return results
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
@@ -0,0 +1,73 @@
+import asyncio
+from asyncio import Future, Task, TimerHandle
+from typing import Any, Awaitable, Callable, Optional
+
+from app.store.vk_api.dataclasses import Message
+
+MAX_BATCH_SIZE = 25
+
+
+class MessageBatcher:
+    """Coalesces concurrent sends into batches.
+
+    Messages queued within ``window`` seconds (or until ``max_size`` messages
+    are pending) are passed to ``send_batch`` together.  ``send_batch`` must
+    return one result per message; an exception in place of a result fails
+    only that message's sender.
+    """
+
+    def __init__(
+        self,
+        send_batch: Callable[[list[Message]], Awaitable[list[Any]]],
+        max_size: int = MAX_BATCH_SIZE,
+        window: float = 0.02,
+    ):
+        self.send_batch = send_batch
+        self.max_size = max_size
+        self.window = window
+        self._pending: list[tuple[Message, Future]] = []
+        self._timer: Optional[TimerHandle] = None
+        self._tasks: set[Task] = set()
+
+    async def send(self, message: Message) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((message, future))
+        if len(self._pending) >= self.max_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self.flush)
+        return await future
+
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = self._pending[: self.max_size]
+            self._pending = self._pending[self.max_size :]
+            task = asyncio.create_task(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def close(self):
+        self.flush()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _send(self, batch: list[tuple[Message, Future]]):
+        try:
+            results = await self.send_batch([message for message, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        missing = RuntimeError("send_batch returned no result for the message")
+        results = [*results, *[missing] * (len(batch) - len(results))]
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -1,20 +1,28 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UpdateObject:
     id: int
     user_id: int
     body: str
 
+    @classmethod
+    def from_dict(cls, raw: dict) -> "UpdateObject":
+        return cls(raw["id"], raw["user_id"], raw["body"])
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Update:
     type: str
     object: UpdateObject
 
+    @classmethod
+    def from_dict(cls, raw: dict) -> "Update":
+        return cls(raw["type"], UpdateObject.from_dict(raw["object"]))
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Message:
     user_id: int
     text: str
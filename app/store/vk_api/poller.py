@@ -1,25 +1,96 @@
 import asyncio
-from asyncio import Task
+from asyncio import Queue, Task
+from logging import getLogger
+from time import monotonic
 from typing import Optional
 
 from app.store import Store
+from app.store.vk_api.dataclasses import Update
+
+MAX_BATCH_SIZE = 100
+# Pause after an unexpected polling error, so a persistent one does not spin.
+POLL_ERROR_DELAY = 1.0
 
 
 class Poller:
-    def __init__(self, store: Store):
+    """Long-polls VK and hands updates over to worker tasks.
+
+    Updates are sharded between the workers by ``user_id``, so the updates of
+    one user are always handled by the same worker and in order.  The queues
+    are bounded: when the workers fall behind, polling blocks until they catch
+    up.
+    """
+
+    def __init__(self, store: Store, queue_size: int = 1000, workers: int = 4):
         self.store = store
+        self.logger = getLogger("poller")
         self.is_running = False
         self.poll_task: Optional[Task] = None
+        self.worker_tasks: list[Task] = []
+        self.queues: list[Queue[tuple[float, Update]]] = [
+            Queue(maxsize=max(1, queue_size // workers)) for _ in range(workers)
+        ]
+        self.lag: float = 0.0
+        self.max_lag: float = 0.0
+        self.handled: int = 0
 
     async def start(self):
         self.is_running = True
+        self.worker_tasks = [
+            asyncio.create_task(self.work(queue)) for queue in self.queues
+        ]
         self.poll_task = asyncio.create_task(self.poll())
 
     async def stop(self):
         self.is_running = False
-        await self.poll_task
+        if self.poll_task:
+            # A failed poll task must not keep the rest of shutdown from running.
+            await asyncio.gather(self.poll_task, return_exceptions=True)
+        for queue in self.queues:
+            await queue.join()
+        for task in self.worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self.worker_tasks, return_exceptions=True)
 
     async def poll(self):
         while self.is_running:
-            updates = await self.store.vk_api.poll()
-            await self.store.bots_manager.handle_updates(updates)
+            try:
+                updates = await self.store.vk_api.poll()
+                for update in updates or []:
+                    await self.put(update)
+            except Exception as e:
+                self.logger.error("Exception", exc_info=e)
+                await asyncio.sleep(POLL_ERROR_DELAY)
+
+    async def put(self, update: Update):
+        queue = self.queues[update.object.user_id % len(self.queues)]
+        if queue.full():
+            self.logger.warning("update queue is full, polling is throttled: %s", self.stats())
+        await queue.put((monotonic(), update))
+
+    async def work(self, queue: Queue[tuple[float, Update]]):
+        while True:
+            batch = [await queue.get()]
+            while not queue.empty() and len(batch) < MAX_BATCH_SIZE:
+                batch.append(queue.get_nowait())
+
+            self.lag = monotonic() - batch[0][0]
+            self.max_lag = max(self.max_lag, self.lag)
+            try:
+                await self.store.bots_manager.handle_updates(
+                    [update for _, update in batch]
+                )
+            except Exception as e:
+                self.logger.error("Exception", exc_info=e)
+            finally:
+                self.handled += len(batch)
+                for _ in batch:
+                    queue.task_done()
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": sum(queue.qsize() for queue in self.queues),
+            "lag": self.lag,
+            "max_lag": self.max_lag,
+            "handled": self.handled,
+        }
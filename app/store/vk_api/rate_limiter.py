@@ -0,0 +1,61 @@
+import asyncio
+import heapq
+import itertools
+from asyncio import Future, TimerHandle
+from time import monotonic
+from typing import Optional
+
+PRIORITY_HIGH = 0
+PRIORITY_LOW = 1
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` calls per second with bursts of ``burst``.
+
+    When the bucket is empty callers wait in a priority queue, so a
+    ``PRIORITY_HIGH`` call always goes before ``PRIORITY_LOW`` ones that are
+    already waiting.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated_at = monotonic()
+        self._waiters: list[tuple[int, int, Future]] = []
+        self._counter = itertools.count()
+        self._timer: Optional[TimerHandle] = None
+
+    async def acquire(self, priority: int = PRIORITY_HIGH):
+        if not self._waiters and self._take():
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        self._schedule()
+        await future
+
+    def _take(self) -> bool:
+        now = monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _schedule(self):
+        if self._timer is None and self._waiters:
+            delay = max(0.0, (1 - self._tokens) / self.rate)
+            self._timer = asyncio.get_running_loop().call_later(delay, self._wake)
+
+    def _wake(self):
+        self._timer = None
+        while self._waiters:
+            if self._waiters[0][2].cancelled():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._take():
+                break
+            _, _, future = heapq.heappop(self._waiters)
+            future.set_result(None)
+        self._schedule()
@@ -6,22 +6,23 @@ from aiohttp.web import (
     View as AiohttpView,
 )
 from aiohttp_apispec import setup_aiohttp_apispec
-from aiohttp_session import setup as session_setup
-from aiohttp_session.cookie_storage import EncryptedCookieStorage
 
 from app.admin.models import Admin
+from app.base.cache import TTLCache
 from app.store import Store, setup_store
 from app.store.database.database import Database
 from app.web.config import Config, setup_config
 from app.web.logger import setup_logging
 from app.web.middlewares import setup_middlewares
 from app.web.routes import setup_routes
+from app.web.session import setup_session
 
 
 class Application(AiohttpApplication):
     config: Optional[Config] = None
     store: Optional[Store] = None
     database: Optional[Database] = None
+    auth_cache: Optional[TTLCache] = None
 
 
 class Request(AiohttpRequest):
@@ -56,7 +57,7 @@ app = Application()
 def setup_app(config_path: str) -> Application:
     setup_logging(app)
     setup_config(app, config_path)
-    session_setup(app, EncryptedCookieStorage(app.config.session.key))
+    setup_session(app)
     setup_routes(app)
     setup_aiohttp_apispec(
         app, title="Vk Quiz Bot", url="/docs/json", swagger_path="/docs"
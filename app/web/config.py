@@ -1,5 +1,6 @@
 import typing
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
 
 import yaml
 
@@ -10,18 +11,48 @@ if typing.TYPE_CHECKING:
 @dataclass
 class SessionConfig:
     key: str
+    storage: str = "cookie"
+    store_size: int = 10000
+    store_ttl: float = 86400.0
+    cache_size: int = 1024
+    cache_ttl: float = 60.0
 
 
 @dataclass
 class AdminConfig:
     email: str
     password: str
+    hash_concurrency: int = 4
 
 
 @dataclass
 class BotConfig:
     token: str
     group_id: int
+    concurrency: int = 10
+    queue_size: int = 1000
+    workers: int = 4
+    send_window: float = 0.02
+    rate_limit: float = 20.0
+    max_retries: int = 3
+    retry_backoff: float = 0.5
+    api_path: str = "https://api.vk.com/method/"
+    connection_limit: int = 100
+    connection_limit_per_host: int = 30
+    keepalive_timeout: float = 30.0
+    dns_cache_ttl: int = 300
+    connect_timeout: float = 5.0
+    request_timeout: float = 10.0
+
+
+@dataclass
+class DatabasePoolConfig:
+    size: int = 5
+    max_overflow: int = 10
+    recycle: int = 1800
+    pre_ping: bool = True
+    timeout: float = 30.0
+    statement_cache_size: int = 100
 
 
 @dataclass
@@ -31,10 +62,38 @@ class DatabaseConfig:
     user: str = "postgres"
     password: str = "postgres"
     database: str = "project"
+    echo: bool = False
+    pool: DatabasePoolConfig = field(default_factory=DatabasePoolConfig)
+    replica: Optional["DatabaseConfig"] = None
+    read_your_writes: float = 1.0
 
     @property
     def url(self):
-        return f"postgresql+asyncpg://{self.user}:{self.password}@{self.host}/{self.database}"
+        return (
+            f"postgresql+asyncpg://{self.user}:{self.password}"
+            f"@{self.host}:{self.port}/{self.database}"
+        )
+
+
+@dataclass
+class SchedulerConfig:
+    tick: float = 0.1
+    slots: int = 512
+
+
+@dataclass
+class GameConfig:
+    rounds: int = 5
+    question_timeout: float = 30.0
+    flush_interval: float = 1.0
+    flush_size: int = 500
+    max_pending: int = 100000
+
+
+@dataclass
+class CacheConfig:
+    maxsize: int = 1024
+    ttl: float = 60.0
 
 
 @dataclass
@@ -43,6 +102,9 @@ class Config:
     session: SessionConfig = None
     bot: BotConfig = None
     database: DatabaseConfig = None
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    game: GameConfig = field(default_factory=GameConfig)
+    scheduler: SchedulerConfig = field(default_factory=SchedulerConfig)
 
 
 def setup_config(app: "Application", config_path: str):
@@ -50,16 +112,25 @@ def setup_config(app: "Application", config_path: str):
         raw_config = yaml.safe_load(f)
 
     app.config = Config(
-        session=SessionConfig(
-            key=raw_config["session"]["key"],
-        ),
-        admin=AdminConfig(
-            email=raw_config["admin"]["email"],
-            password=raw_config["admin"]["password"],
-        ),
-        bot=BotConfig(
-            token=raw_config["bot"]["token"],
-            group_id=raw_config["bot"]["group_id"],
-        ),
-        database=DatabaseConfig(**raw_config["database"]),
+        session=SessionConfig(**raw_config["session"]),
+        admin=AdminConfig(**raw_config["admin"]),
+        bot=BotConfig(**raw_config["bot"]),
+        database=load_database_config(raw_config["database"]),
+        cache=CacheConfig(**raw_config.get("cache", {})),
+        game=GameConfig(**raw_config.get("game", {})),
+        scheduler=SchedulerConfig(**raw_config.get("scheduler", {})),
+    )
+
+
+def load_database_config(raw_database: dict) -> DatabaseConfig:
+    fields_ = {k: v for k, v in raw_database.items() if k not in ("pool", "replica")}
+    replica = None
+    if raw_replica := raw_database.get("replica"):
+        replica = load_database_config(
+            {**fields_, "pool": raw_database.get("pool", {}), **raw_replica}
+        )
+    return DatabaseConfig(
+        **fields_,
+        pool=DatabasePoolConfig(**raw_database.get("pool", {})),
+        replica=replica,
     )
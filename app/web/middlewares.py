@@ -1,12 +1,12 @@
 import json
+import math
 import typing
 
 from aiohttp.web_exceptions import HTTPException, HTTPUnprocessableEntity
 from aiohttp.web_middlewares import middleware
 from aiohttp_apispec import validation_middleware
-from aiohttp_session import get_session
 
-from app.admin.models import Admin
+from app.web.session import get_admin
 from app.web.utils import error_json_response
 
 if typing.TYPE_CHECKING:
@@ -15,17 +15,51 @@ if typing.TYPE_CHECKING:
 
 @middleware
 async def auth_middleware(request: "Request", handler: callable):
-    session = await get_session(request)
-    if manager_data := session.get("admin"):
-        request.admin = Admin(
-            id=manager_data["id"],
-            email=manager_data["email"]
-        )
+    # Only views that ask for the admin pay for loading the session.
+    if getattr(request.match_info.handler, "auth_required", False):
+        request.admin = await get_admin(request)
     else:
         request.admin = None
     return await handler(request)
 
 
+@middleware
+async def unit_of_work_middleware(request: "Request", handler: callable):
+    # Accessor calls of a request share one lazily opened transaction;
+    # views that stream long uploads opt out with unit_of_work = False.
+    if not getattr(request.match_info.handler, "unit_of_work", True):
+        return await handler(request)
+    async with request.app.database.unit_of_work():
+        return await handler(request)
+
+
+READ_YOUR_WRITES_COOKIE = "last_write_at"
+
+
+@middleware
+async def read_your_writes_middleware(request: "Request", handler: callable):
+    # Every request runs in a task of its own, so an admin's last write is
+    # carried to their next requests in a cookie; they read from the primary
+    # until the replica has surely caught up.
+    database = request.app.database
+    cookie = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    if cookie and request.admin is not None:
+        try:
+            database.restore_last_write_at(float(cookie))
+        except ValueError:
+            pass
+    written_at = database.last_write_at()
+    response = await handler(request)
+    if database.last_write_at() > written_at and not response.prepared:
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            repr(database.last_write_at()),
+            max_age=math.ceil(request.app.config.database.read_your_writes),
+            httponly=True,
+        )
+    return response
+
+
 HTTP_ERROR_CODES = {
     400: "bad_request",
     401: "unauthorized",
@@ -33,6 +67,7 @@ HTTP_ERROR_CODES = {
     404: "not_found",
     405: "not_implemented",
     409: "conflict",
+    413: "request_entity_too_large",
     500: "internal_server_error",
 }
 
@@ -65,4 +100,6 @@ async def error_handling_middleware(request: "Request", handler):
 def setup_middlewares(app: "Application"):
     app.middlewares.append(auth_middleware)
     app.middlewares.append(error_handling_middleware)
+    app.middlewares.append(read_your_writes_middleware)
+    app.middlewares.append(unit_of_work_middleware)
     app.middlewares.append(validation_middleware)
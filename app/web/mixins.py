@@ -3,6 +3,8 @@ from aiohttp.web_exceptions import HTTPUnauthorized
 
 
 class AuthRequiredMixin:
+    auth_required = True
+
     async def _iter(self) -> StreamResponse:
         if not getattr(self.request, "admin", None):
             raise HTTPUnauthorized
@@ -0,0 +1,77 @@
+from functools import cache
+from typing import Any, Callable
+
+from marshmallow import Schema, fields
+
+_MISSING = object()
+
+
+def _get(obj: Any, name: str) -> Any:
+    if isinstance(obj, dict):
+        return obj.get(name, _MISSING)
+    return getattr(obj, name, _MISSING)
+
+
+def compile_dumper(schema: Schema) -> Callable[[Any], dict]:
+    """Build a function equivalent to ``schema.dump`` for well-typed objects.
+
+    The field list is resolved once, so dumping skips marshmallow's
+    per-call machinery.  Plain values are copied as is: the objects must
+    already hold the types the schema declares, as our DTOs do.
+    """
+    getters: list[tuple[str, Callable[[Any], Any]]] = []
+    for name, field in schema.dump_fields.items():
+        attribute = field.attribute or name
+        key = field.data_key or name
+        if isinstance(field, fields.Nested):
+            nested = compile_dumper(field.schema)
+            if field.many:
+                getter = _many_getter(attribute, nested)
+            else:
+                getter = _nested_getter(attribute, nested)
+        else:
+            getter = _plain_getter(attribute)
+        getters.append((key, getter))
+
+    def dump(obj: Any) -> dict:
+        data = {}
+        for key, getter in getters:
+            value = getter(obj)
+            if value is not _MISSING:
+                data[key] = value
+        return data
+
+    return dump
+
+
+def _plain_getter(attribute: str) -> Callable[[Any], Any]:
+    return lambda obj: _get(obj, attribute)
+
+
+def _nested_getter(attribute: str, nested: Callable[[Any], dict]) -> Callable[[Any], Any]:
+    def getter(obj: Any) -> Any:
+        value = _get(obj, attribute)
+        if value is _MISSING or value is None:
+            return value
+        return nested(value)
+
+    return getter
+
+
+def _many_getter(attribute: str, nested: Callable[[Any], dict]) -> Callable[[Any], Any]:
+    def getter(obj: Any) -> Any:
+        values = _get(obj, attribute)
+        if values is _MISSING or values is None:
+            return values
+        return [nested(value) for value in values]
+
+    return getter
+
+
+@cache
+def dumper(schema_cls: type[Schema]) -> Callable[[Any], dict]:
+    return compile_dumper(schema_cls())
+
+
+def dump(schema_cls: type[Schema], obj: Any) -> dict:
+    return dumper(schema_cls)(obj)
@@ -0,0 +1,97 @@
+import secrets
+import typing
+from typing import Optional
+
+from aiohttp import web
+from aiohttp_session import STORAGE_KEY, AbstractStorage, Session, get_session
+from aiohttp_session import setup as session_setup
+from aiohttp_session.cookie_storage import EncryptedCookieStorage
+
+from app.admin.models import Admin
+from app.base.cache import TTLCache
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application, Request
+
+STORAGE_COOKIE = "cookie"
+STORAGE_MEMORY = "memory"
+
+
+class MemoryStorage(AbstractStorage):
+    """Keeps session data in process memory; the cookie holds only a random id.
+
+    Sessions are lost on restart and are not shared between instances, so
+    this suits a single bot process.  A replaced id is also dropped from
+    ``auth_cache``, so it stops authenticating right away.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        ttl: float = 86400.0,
+        auth_cache: Optional[TTLCache] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._sessions = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._auth_cache = auth_cache
+
+    async def load_session(self, request: web.Request) -> Session:
+        identity = self.load_cookie(request)
+        data = self._sessions.get((identity,)) if identity is not None else None
+        if data is None:
+            return Session(None, data=None, new=True, max_age=self.max_age)
+        return Session(identity, data=data, new=False, max_age=self.max_age)
+
+    async def save_session(
+        self, request: web.Request, response: web.StreamResponse, session: Session
+    ) -> None:
+        # The request's id is replaced whether the session was loaded from it
+        # or started afresh with new_session().
+        for identity in {session.identity, self.load_cookie(request)} - {None}:
+            self._sessions.delete((identity,))
+            if self._auth_cache is not None:
+                self._auth_cache.delete((identity,))
+        if session.empty:
+            self.save_cookie(response, "", max_age=session.max_age)
+            return
+        # A fresh id on every save, so a session id seen before login is
+        # never upgraded to an authenticated one.
+        identity = secrets.token_urlsafe(32)
+        self._sessions.set((identity,), self._get_session_data(session))
+        self.save_cookie(response, identity, max_age=session.max_age)
+
+
+async def get_admin(request: "Request") -> Optional[Admin]:
+    """Return the admin the request's session belongs to.
+
+    Verified cookies are remembered for ``session.cache_ttl`` seconds, so
+    repeat requests skip decrypting and loading the session.
+    """
+    cookie = request[STORAGE_KEY].load_cookie(request)
+    if cookie is None:
+        return None
+    cache = request.app.auth_cache
+    if (admin := cache.get((cookie,))) is not None:
+        return admin
+
+    session = await get_session(request)
+    if not (manager_data := session.get("admin")):
+        return None
+    admin = Admin(id=manager_data["id"], email=manager_data["email"])
+    cache.set((cookie,), admin)
+    return admin
+
+
+def setup_session(app: "Application"):
+    config = app.config.session
+    app.auth_cache = TTLCache(maxsize=config.cache_size, ttl=config.cache_ttl)
+    if config.storage == STORAGE_MEMORY:
+        storage = MemoryStorage(
+            maxsize=config.store_size, ttl=config.store_ttl, auth_cache=app.auth_cache
+        )
+    elif config.storage == STORAGE_COOKIE:
+        storage = EncryptedCookieStorage(config.key)
+    else:
+        raise ValueError(f"unknown session storage: {config.storage}")
+    session_setup(app, storage)
@@ -1,20 +1,34 @@
-from typing import Any, Optional
+from typing import Any, AsyncIterable, Optional
 
 from aiohttp.web import json_response as aiohttp_json_response
-from aiohttp.web_response import Response
+from aiohttp.web_request import Request
+from aiohttp.web_response import Response, StreamResponse
+
+from app.base.json_backend import dumps_bytes
 
 
 def json_response(data: Any = None, status: str = "ok") -> Response:
     if data is None:
         data = {}
     return aiohttp_json_response(
-        data={
-            "status": status,
-            "data": data,
-        }
+        body=dumps_bytes(
+            {
+                "status": status,
+                "data": data,
+            }
+        )
     )
 
 
+async def ndjson_response(request: Request, rows: AsyncIterable[Any]) -> StreamResponse:
+    response = StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+    await response.prepare(request)
+    async for row in rows:
+        await response.write(dumps_bytes(row) + b"\n")
+    await response.write_eof()
+    return response
+
+
 def error_json_response(
     http_status: int,
     status: str = "error",
@@ -25,9 +39,11 @@ def error_json_response(
         data = {}
     return aiohttp_json_response(
         status=http_status,
-        data={
-            "status": status,
-            "message": str(message),
-            "data": data,
-        },
+        body=dumps_bytes(
+            {
+                "status": status,
+                "message": str(message),
+                "data": data,
+            }
+        ),
     )
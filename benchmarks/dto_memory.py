@@ -0,0 +1,99 @@
+"""Memory held by a question catalog of slotted DTOs versus plain dataclasses.
+
+    python -m benchmarks.dto_memory 100000
+"""
+import sys
+import tracemalloc
+from dataclasses import dataclass
+
+from app.quiz.models import Answer, Question
+from app.store.vk_api.dataclasses import Update, UpdateObject
+
+ANSWERS_PER_QUESTION = 4
+ANSWER_TITLES = [f"answer {j}" for j in range(ANSWERS_PER_QUESTION)]
+
+
+@dataclass
+class PlainAnswer:
+    title: str
+    is_correct: bool
+
+
+@dataclass
+class PlainQuestion:
+    id: int | None
+    title: str
+    theme_id: int
+    answers: list[PlainAnswer]
+
+
+@dataclass
+class PlainUpdateObject:
+    id: int
+    user_id: int
+    body: str
+
+
+@dataclass
+class PlainUpdate:
+    type: str
+    object: PlainUpdateObject
+
+
+def build_questions(titles: list[str], question_cls, answer_cls) -> list:
+    return [
+        question_cls(
+            id=i,
+            title=title,
+            theme_id=1,
+            answers=[
+                answer_cls(title=ANSWER_TITLES[j], is_correct=j == 0)
+                for j in range(ANSWERS_PER_QUESTION)
+            ],
+        )
+        for i, title in enumerate(titles)
+    ]
+
+
+def build_updates(bodies: list[str], update_cls, object_cls) -> list:
+    return [
+        update_cls(type="message_new", object=object_cls(id=i, user_id=i, body=body))
+        for i, body in enumerate(bodies)
+    ]
+
+
+def measure(build) -> int:
+    tracemalloc.start()
+    objects = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def main(count: int):
+    # Strings are shared by both variants and created up front, so only the
+    # DTOs themselves are measured.
+    titles = [f"question {i}" for i in range(count)]
+
+    cases = {
+        "questions": (
+            lambda: build_questions(titles, PlainQuestion, PlainAnswer),
+            lambda: build_questions(titles, Question, Answer),
+        ),
+        "updates": (
+            lambda: build_updates(titles, PlainUpdate, PlainUpdateObject),
+            lambda: build_updates(titles, Update, UpdateObject),
+        ),
+    }
+    for name, (plain, slotted) in cases.items():
+        plain_size, slotted_size = measure(plain), measure(slotted)
+        print(
+            f"{name:>9}: plain {plain_size / count:7.1f} B, "
+            f"slotted {slotted_size / count:7.1f} B per item "
+            f"({1 - slotted_size / plain_size:.0%} less)"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,52 @@
+"""Time picking a game's questions: loading the whole theme and sampling it
+against drawing ids from the question index and loading only those.
+
+Truncates the quiz tables like ``benchmarks.quiz_loaders``:
+
+    CONFIGPATH=tests/config.yml python -m benchmarks.question_sampling 10000
+"""
+import asyncio
+import os
+import random
+import sys
+from time import perf_counter
+
+from app.web.app import setup_app
+from benchmarks.quiz_loaders import REPEATS, seed, truncate
+
+ROUNDS = 5
+
+
+async def main(count: int):
+    app = setup_app(config_path=os.environ.get("CONFIGPATH", "config.yml"))
+    await app.database.connect()
+    quizzes = app.store.quizzes
+    try:
+        await truncate(app)
+        await seed(app, count)
+        await quizzes.question_sampler()
+        (theme_id,) = quizzes.question_ids
+
+        async def list_and_sample():
+            return random.sample(await quizzes.list_questions(theme_id), ROUNDS)
+
+        async def index_and_fetch():
+            sampler = await quizzes.question_sampler(theme_id)
+            return await quizzes.get_questions(sampler.sample(ROUNDS))
+
+        for pick in (list_and_sample, index_and_fetch):
+            timings = []
+            for _ in range(REPEATS):
+                quizzes.cache.clear()
+                started = perf_counter()
+                questions = await pick()
+                timings.append(perf_counter() - started)
+            assert len(questions) == ROUNDS
+            print(f"{pick.__name__:>16}: best {min(timings) * 1000:8.2f} ms")
+    finally:
+        await truncate(app)
+        await app.database.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000))
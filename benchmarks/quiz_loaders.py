@@ -0,0 +1,74 @@
+"""Compare the question loader strategies of QuizAccessor.
+
+Seeds the configured database with questions and times ``list_questions``
+with every loader.  The tables are truncated before and after the run, so
+point CONFIGPATH at a throwaway database:
+
+    CONFIGPATH=tests/config.yml python -m benchmarks.quiz_loaders 10000
+"""
+import asyncio
+import os
+import sys
+from time import perf_counter
+
+from sqlalchemy import insert, text
+
+from app.quiz.models import AnswerModel, QuestionModel, ThemeModel
+from app.store.quiz.accessor import QUESTION_LOADERS
+from app.web.app import setup_app
+
+ANSWERS_PER_QUESTION = 4
+REPEATS = 5
+
+
+async def truncate(app):
+    async with app.database.session.begin() as session:
+        await session.execute(text("TRUNCATE themes, questions, answers CASCADE"))
+
+
+async def seed(app, count: int):
+    async with app.database.session.begin() as session:
+        theme_id = await session.scalar(
+            insert(ThemeModel).values(title="benchmark").returning(ThemeModel.id)
+        )
+        question_ids = await session.scalars(
+            insert(QuestionModel).returning(QuestionModel.id),
+            [{"title": f"question {i}", "theme_id": theme_id} for i in range(count)],
+        )
+        await session.execute(
+            insert(AnswerModel),
+            [
+                {
+                    "title": f"answer {i}",
+                    "is_correct": i == 0,
+                    "question_id": question_id,
+                }
+                for question_id in question_ids.all()
+                for i in range(ANSWERS_PER_QUESTION)
+            ],
+        )
+
+
+async def main(count: int):
+    app = setup_app(config_path=os.environ.get("CONFIGPATH", "config.yml"))
+    await app.database.connect()
+    quizzes = app.store.quizzes
+    try:
+        await truncate(app)
+        await seed(app, count)
+        for loader in QUESTION_LOADERS:
+            timings = []
+            for _ in range(REPEATS):
+                quizzes.cache.clear()
+                started = perf_counter()
+                questions = await quizzes.list_questions(loader=loader)
+                timings.append(perf_counter() - started)
+            assert len(questions) == count
+            print(f"{loader:>10}: best {min(timings) * 1000:8.1f} ms")
+    finally:
+        await truncate(app)
+        await app.database.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000))
@@ -0,0 +1,53 @@
+"""Time to serialize a question list with marshmallow versus compiled dumpers.
+
+    python -m benchmarks.serialization 10000
+"""
+import json
+import sys
+from time import perf_counter
+
+from app.base.json_backend import BACKEND, dumps_bytes
+from app.quiz.models import Answer, Question
+from app.quiz.schemes import ListQuestionSchema
+from app.web.serializers import dump
+
+ANSWERS_PER_QUESTION = 4
+
+
+def build_questions(count: int) -> list[Question]:
+    return [
+        Question(
+            id=i,
+            title=f"question {i}",
+            theme_id=1,
+            answers=[
+                Answer(title=f"answer {j}", is_correct=j == 0)
+                for j in range(ANSWERS_PER_QUESTION)
+            ],
+        )
+        for i in range(count)
+    ]
+
+
+def timed(fn) -> float:
+    started = perf_counter()
+    fn()
+    return (perf_counter() - started) * 1000
+
+
+def main(count: int):
+    data = {"questions": build_questions(count)}
+    assert ListQuestionSchema().dump(data) == dump(ListQuestionSchema, data)
+
+    cases = {
+        "marshmallow + json": lambda: json.dumps(ListQuestionSchema().dump(data)).encode(),
+        f"compiled + {BACKEND}": lambda: dumps_bytes(dump(ListQuestionSchema, data)),
+    }
+    for name, fn in cases.items():
+        fn()
+        best = min(timed(fn) for _ in range(5))
+        print(f"{name:>24}: {best:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,80 @@
+"""Question deadlines on the timer wheel versus one sleeping task per game.
+
+Schedules ``count`` deadlines spread over one second, answers (cancels)
+half of them and waits for the rest to fire.
+
+    python -m benchmarks.timers 50000
+"""
+import asyncio
+import random
+import sys
+import tracemalloc
+from time import perf_counter
+
+from app.base.timer_wheel import TimerWheel
+
+SPREAD = 1.0
+
+
+async def sleep_then(delay: float, callback):
+    await asyncio.sleep(delay)
+    callback()
+
+
+async def run_tasks(delays: list[float], fired: list) -> dict:
+    started = perf_counter()
+    timers = [
+        asyncio.create_task(sleep_then(delay, lambda: fired.append(1))) for delay in delays
+    ]
+    # Let the tasks reach their sleep, as they would in a live bot.
+    await asyncio.sleep(0)
+    scheduled = perf_counter()
+    for task in timers[::2]:
+        task.cancel()
+    cancelled = perf_counter()
+    await asyncio.gather(*timers, return_exceptions=True)
+    return {"schedule": scheduled - started, "cancel": cancelled - scheduled}
+
+
+async def run_wheel(delays: list[float], fired: list) -> dict:
+    wheel = TimerWheel(tick=0.1, slots=512)
+    wheel.start()
+    started = perf_counter()
+    timers = [wheel.call_later(delay, fired.append, 1) for delay in delays]
+    scheduled = perf_counter()
+    for timer in timers[::2]:
+        timer.cancel()
+    cancelled = perf_counter()
+    while len(wheel):
+        await asyncio.sleep(0.05)
+    await wheel.stop()
+    return {"schedule": scheduled - started, "cancel": cancelled - scheduled}
+
+
+def measure(run, delays: list[float]) -> None:
+    fired: list = []
+    started = perf_counter()
+    result = asyncio.run(run(delays, fired))
+    total = perf_counter() - started
+    assert len(fired) == len(delays) // 2
+
+    # Memory is traced in a second run, tracing would skew the timings.
+    tracemalloc.start()
+    asyncio.run(run(delays, []))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{run.__name__:>10}: schedule {result['schedule'] * 1000:7.1f} ms, "
+        f"cancel {result['cancel'] * 1000:6.1f} ms, "
+        f"total {total:5.2f} s, peak memory {peak / 2**20:6.1f} MiB"
+    )
+
+
+def main(count: int):
+    delays = [random.uniform(0.5, 0.5 + SPREAD) for _ in range(count)]
+    for run in (run_tasks, run_wheel):
+        measure(run, delays)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,60 @@
+"""Compare long poll response decoding: stdlib json with field-by-field
+``Update`` construction against the JSON backend with ``Update.from_dict``.
+
+    python -m benchmarks.update_decoding 1000
+"""
+import json
+import sys
+from timeit import repeat
+
+from app.base import json_backend
+from app.store.vk_api.dataclasses import Update, UpdateObject
+
+REPEATS = 5
+
+
+def stdlib_decode(raw: bytes) -> list[Update]:
+    data = json.loads(raw)
+    updates = []
+    for update in data.get("updates", []):
+        updates.append(
+            Update(
+                type=update["type"],
+                object=UpdateObject(
+                    id=update["object"]["id"],
+                    user_id=update["object"]["user_id"],
+                    body=update["object"]["body"],
+                ),
+            )
+        )
+    return updates
+
+
+def backend_decode(raw: bytes) -> list[Update]:
+    data = json_backend.loads(raw)
+    return [Update.from_dict(update) for update in data.get("updates", [])]
+
+
+def main(count: int):
+    raw = json.dumps(
+        {
+            "ts": 1,
+            "updates": [
+                {
+                    "type": "message_new",
+                    "object": {"id": i, "user_id": i % 100, "body": f"сообщение {i}"},
+                }
+                for i in range(count)
+            ],
+        }
+    ).encode()
+    assert stdlib_decode(raw) == backend_decode(raw)
+
+    number = max(1, 100_000 // count)
+    for name, decode in (("stdlib", stdlib_decode), (json_backend.BACKEND, backend_decode)):
+        best = min(repeat(lambda: decode(raw), number=number, repeat=REPEATS)) / number
+        print(f"{name:>8}: {best * 1e6:10.1f} us per {count} updates")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
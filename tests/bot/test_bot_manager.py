@@ -1,6 +1,16 @@
+import asyncio
+from unittest.mock import AsyncMock
+
 from app.store.vk_api.dataclasses import Message, Update, UpdateObject
 
 
+def make_update(id_: int, user_id: int) -> Update:
+    return Update(
+        type="message_new",
+        object=UpdateObject(id=id_, user_id=user_id, body="kek"),
+    )
+
+
 class TestHandleUpdates:
     async def test_no_messages(self, store):
         await store.bots_manager.handle_updates(updates=[])
@@ -23,3 +33,44 @@ class TestHandleUpdates:
         message: Message = store.vk_api.send_message.mock_calls[0].args[0]
         assert message.user_id == 1
         assert message.text
+
+    async def test_users_handled_concurrently(self, store, mocker):
+        in_flight = 0
+        max_in_flight = 0
+        sent: list[int] = []
+
+        async def send_message(message: Message):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            sent.append(message.user_id)
+            in_flight -= 1
+
+        mocker.patch.object(store.vk_api, "send_message", side_effect=send_message)
+        await store.bots_manager.handle_updates(
+            updates=[make_update(i, user_id=i % 3) for i in range(9)]
+        )
+        assert len(sent) == 9
+        assert max_in_flight == 3
+
+    async def test_user_order_preserved(self, store, mocker):
+        handled: list[int] = []
+
+        async def handle_update(update: Update):
+            await asyncio.sleep(0.01 if update.object.id == 0 else 0)
+            handled.append(update.object.id)
+
+        mocker.patch.object(store.bots_manager, "handle_update", side_effect=handle_update)
+        await store.bots_manager.handle_updates(
+            updates=[make_update(0, user_id=1), make_update(1, user_id=1)]
+        )
+        assert handled == [0, 1]
+
+    async def test_failure_is_isolated(self, store, mocker):
+        send_message = AsyncMock(side_effect=[Exception("boom"), None, None])
+        mocker.patch.object(store.vk_api, "send_message", send_message)
+        await store.bots_manager.handle_updates(
+            updates=[make_update(i, user_id=1) for i in range(3)]
+        )
+        assert send_message.call_count == 3
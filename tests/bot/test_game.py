@@ -0,0 +1,208 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.game.models import EVENT_ANSWER, EVENT_SKIP, Game, GameEvent
+from app.quiz.models import Question
+from app.store.bot.game import HELP_TEXT, parse_command
+from app.store.vk_api.dataclasses import Message, Update, UpdateObject
+
+CHAT_ID = 42
+
+
+def correct_answer(question: Question) -> str:
+    return next(answer.title for answer in question.answers if answer.is_correct)
+
+
+def wrong_answer(question: Question) -> str:
+    return next(answer.title for answer in question.answers if not answer.is_correct)
+
+
+@pytest.fixture
+def game(store):
+    return store.bots_manager.game
+
+
+class TestParseCommand:
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("/start", ("start", "")),
+            ("  /Start   web-development ", ("start", "web-development")),
+            ("well", (None, "well")),
+            ("", (None, "")),
+        ],
+    )
+    def test_parse(self, text, expected):
+        assert parse_command(text) == expected
+
+
+class TestGameEngine:
+    async def test_help_without_game(self, game):
+        assert await game.handle(CHAT_ID, CHAT_ID, "hello") == HELP_TEXT
+        assert (await game.handle(CHAT_ID, CHAT_ID, "/stop")).startswith("Игра не идёт")
+
+    async def test_no_questions(self, game):
+        assert await game.handle(CHAT_ID, CHAT_ID, "/start") == "Вопросов пока нет."
+        assert CHAT_ID not in game.states
+
+    async def test_unknown_theme(self, game):
+        assert "нет" in await game.handle(CHAT_ID, CHAT_ID, "/start nope")
+
+    async def test_full_game(self, game, store, theme_1, question_1, question_2):
+        reply = await game.handle(CHAT_ID, CHAT_ID, f"/start {theme_1.title}")
+        assert reply.startswith("Игра началась!")
+        state = game.states[CHAT_ID]
+        first, second = state.questions
+        assert first.title in reply
+
+        reply = await game.handle(CHAT_ID, CHAT_ID, correct_answer(first).upper())
+        assert reply.startswith("Верно!")
+        assert second.title in reply
+
+        reply = await game.handle(CHAT_ID, CHAT_ID, wrong_answer(second))
+        assert reply.startswith("Неверно")
+        assert "Игра окончена" in reply
+        assert f"id{CHAT_ID}: 1" in reply
+        assert CHAT_ID not in game.states
+        assert state.participants == {CHAT_ID}
+
+    async def test_answer_by_number(self, game, question_1):
+        await game.handle(CHAT_ID, CHAT_ID, "/start")
+        question = game.states[CHAT_ID].question
+        number = next(
+            i for i, answer in enumerate(question.answers, start=1) if answer.is_correct
+        )
+        assert (await game.handle(CHAT_ID, CHAT_ID, str(number))).startswith("Верно!")
+
+    async def test_unrecognized_answer(self, game, question_1):
+        await game.handle(CHAT_ID, CHAT_ID, "/start")
+        reply = await game.handle(CHAT_ID, CHAT_ID, "maybe")
+        assert reply == "Ответьте номером или текстом варианта."
+        assert game.states[CHAT_ID].current == 0
+
+    async def test_chats_are_independent(self, game, question_1, question_2):
+        await game.handle(1, 1, "/start")
+        await game.handle(2, 2, "/start")
+        await game.handle(1, 1, "/skip")
+        assert game.states[1].current == 1
+        assert game.states[2].current == 0
+
+    async def test_answer_does_not_touch_database(self, game, server, question_1, mocker):
+        await game.handle(CHAT_ID, CHAT_ID, "/start")
+        mocker.patch.object(server.database, "write_session", MagicMock())
+        mocker.patch.object(server.database, "read_session", MagicMock())
+        await game.handle(CHAT_ID, CHAT_ID, "/skip")
+        server.database.write_session.assert_not_called()
+        server.database.read_session.assert_not_called()
+
+    async def test_events_persisted(self, game, store, theme_1, question_1, question_2):
+        await game.handle(CHAT_ID, CHAT_ID, "/start")
+        state = game.states[CHAT_ID]
+        first = state.question
+        await game.handle(CHAT_ID, CHAT_ID, correct_answer(first))
+        await game.handle(CHAT_ID, CHAT_ID, "/skip")
+        assert await store.games.get_game(state.id) is None
+
+        await store.games.flush()
+        saved = await store.games.get_game(state.id)
+        assert saved.chat_id == CHAT_ID
+        assert saved.finished_at is not None
+        events = await store.games.list_events(state.id)
+        assert [(event.kind, event.is_correct) for event in events] == [
+            (EVENT_ANSWER, True),
+            (EVENT_SKIP, None),
+        ]
+        assert events[0].question_id == first.id
+
+
+class TestBotManager:
+    async def test_game_over_vk(self, store, question_1, mocker):
+        mocker.patch.object(store.vk_api, "send_message")
+        await store.bots_manager.handle_updates(
+            [Update(type="message_new", object=UpdateObject(id=1, user_id=7, body="/start"))]
+        )
+        message: Message = store.vk_api.send_message.mock_calls[0].args[0]
+        assert message.user_id == 7
+        assert question_1.title in message.text
+
+
+def make_game() -> Game:
+    return Game(
+        id=uuid4(), chat_id=CHAT_ID, theme_id=None, started_at=datetime.now(timezone.utc)
+    )
+
+
+class TestGameAccessor:
+    async def test_failed_flush_keeps_records(self, store, server, mocker):
+        game = make_game()
+        store.games.add_game(game)
+        store.games.finish_game(game.id, datetime.now(timezone.utc))
+        write_session = mocker.patch.object(
+            server.database, "write_session", side_effect=ConnectionError
+        )
+        await store.games.flush()
+        assert store.games.pending() == 2
+
+        write_session.side_effect = None
+        mocker.stopall()
+        await store.games.flush()
+        assert store.games.pending() == 0
+        assert (await store.games.get_game(game.id)).finished_at is not None
+
+    async def test_bad_record_is_discarded(self, store, server):
+        game = make_game()
+        store.games.add_game(game)
+        for game_id in (game.id, uuid4()):
+            store.games.add_event(
+                GameEvent(
+                    game_id=game_id,
+                    user_id=1,
+                    question_id=None,
+                    kind=EVENT_SKIP,
+                    is_correct=None,
+                    created_at=datetime.now(timezone.utc),
+                )
+            )
+        store.games.finish_game(game.id, datetime.now(timezone.utc))
+        rejected = store.games.rejected
+        await store.games.flush()
+        assert store.games.pending() == 0
+        assert store.games.rejected == rejected + 1
+        assert (await store.games.get_game(game.id)).finished_at is not None
+        assert len(await store.games.list_events(game.id)) == 1
+
+    async def test_drops_oldest_events_past_limit(self, store, server, mocker, config):
+        mocker.patch.object(config.game, "max_pending", 3)
+        mocker.patch.object(server.database, "write_session", side_effect=ConnectionError)
+        game = make_game()
+        for i in range(5):
+            store.games.add_event(
+                GameEvent(
+                    game_id=game.id,
+                    user_id=i,
+                    question_id=None,
+                    kind=EVENT_SKIP,
+                    is_correct=None,
+                    created_at=datetime.now(timezone.utc),
+                )
+            )
+        await store.games.flush()
+        assert [event["user_id"] for event in store.games.pending_events] == [2, 3, 4]
+        assert store.games.dropped == 2
+
+    async def test_background_flush(self, store, server, mocker, config):
+        mocker.patch.object(config.game, "flush_size", 2)
+        await store.games.connect(server)
+        game = make_game()
+        store.games.add_game(game)
+        store.games.finish_game(game.id, datetime.now(timezone.utc))
+        for _ in range(100):
+            if store.games.pending() == 0 and store.games.flushed:
+                break
+            await asyncio.sleep(0.01)
+        await store.games.disconnect(server)
+        assert await store.games.get_game(game.id) is not None
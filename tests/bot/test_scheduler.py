@@ -0,0 +1,126 @@
+import asyncio
+import math
+import time
+from unittest.mock import MagicMock
+
+from app.base.timer_wheel import TimerWheel
+from app.game.models import EVENT_TIMEOUT
+from app.store.vk_api.dataclasses import Message
+
+
+class TestTimerWheel:
+    def test_fires_after_delay(self):
+        wheel = TimerWheel(tick=1, slots=8)
+        callback = MagicMock()
+        wheel.call_later(3, callback, "a")
+        wheel.advance(2)
+        callback.assert_not_called()
+        wheel.advance(1)
+        callback.assert_called_once_with("a")
+        assert len(wheel) == 0
+
+    def test_delay_longer_than_revolution(self):
+        wheel = TimerWheel(tick=1, slots=4)
+        callback = MagicMock()
+        wheel.call_later(10, callback)
+        wheel.advance(9)
+        callback.assert_not_called()
+        wheel.advance(1)
+        callback.assert_called_once()
+
+    def test_cancel(self):
+        wheel = TimerWheel(tick=1, slots=8)
+        callback = MagicMock()
+        timer = wheel.call_later(1, callback)
+        timer.cancel()
+        timer.cancel()
+        assert len(wheel) == 0
+        wheel.advance(8)
+        callback.assert_not_called()
+
+    def test_failing_callback_does_not_stop_others(self):
+        wheel = TimerWheel(tick=1, slots=8)
+        callback = MagicMock()
+        wheel.call_later(1, MagicMock(side_effect=Exception("boom")))
+        wheel.call_later(1, callback)
+        wheel.advance(1)
+        callback.assert_called_once()
+
+    async def test_awaitable_callback_runs_as_task(self):
+        wheel = TimerWheel(tick=1, slots=8)
+        done = asyncio.Event()
+
+        async def callback():
+            done.set()
+
+        wheel.call_later(1, callback)
+        wheel.advance(1)
+        await wheel.stop()
+        assert done.is_set()
+
+    async def test_runs_on_loop(self):
+        wheel = TimerWheel(tick=0.01, slots=16)
+        loop = asyncio.get_running_loop()
+        fired = loop.create_future()
+        wheel.start()
+        started = loop.time()
+        wheel.call_later(0.05, lambda: fired.set_result(loop.time()))
+        fired_at = await asyncio.wait_for(fired, 1)
+        await wheel.stop()
+        assert 0.05 <= fired_at - started < 0.1
+
+    async def test_timer_set_while_catching_up(self):
+        wheel = TimerWheel(tick=0.01, slots=64)
+        loop = asyncio.get_running_loop()
+        fired = loop.create_future()
+        scheduled_at = None
+
+        def schedule():
+            nonlocal scheduled_at
+            scheduled_at = loop.time()
+            wheel.call_later(0.05, lambda: fired.set_result(loop.time()))
+
+        wheel.start()
+        await asyncio.sleep(0)
+        wheel.call_later(0.02, schedule)
+        # Block the loop, so the wheel has ten ticks to catch up on.
+        time.sleep(0.1)
+        fired_at = await asyncio.wait_for(fired, 1)
+        await wheel.stop()
+        assert fired_at - scheduled_at >= 0.05
+
+
+class TestQuestionTimeout:
+    async def test_question_expires(self, store, config, question_1, question_2, mocker):
+        send_message = mocker.patch.object(store.vk_api, "send_message")
+        game = store.bots_manager.game
+        wheel = store.scheduler.wheel
+        await game.handle(1, 1, "/start")
+        state = game.states[1]
+        first = state.question
+
+        wheel.advance(math.ceil(config.game.question_timeout / wheel.tick) - 1)
+        assert state.current == 0
+        wheel.advance(1)
+        await wheel.stop()
+
+        assert state.current == 1
+        message: Message = send_message.mock_calls[0].args[0]
+        assert message.user_id == 1
+        assert message.text.startswith("Время вышло!")
+        assert store.games.pending_events[-1]["kind"] == EVENT_TIMEOUT
+        assert store.games.pending_events[-1]["question_id"] == first.id
+
+    async def test_answer_cancels_deadline(self, store, question_1, question_2, mocker):
+        send_message = mocker.patch.object(store.vk_api, "send_message")
+        game = store.bots_manager.game
+        wheel = store.scheduler.wheel
+        await game.handle(1, 1, "/start")
+        assert len(wheel) == 1
+        await game.handle(1, 1, "/skip")
+        assert len(wheel) == 1
+        await game.handle(1, 1, "/stop")
+        assert len(wheel) == 0
+        wheel.advance(len(wheel.slots) * 2)
+        await wheel.stop()
+        send_message.assert_not_called()
@@ -0,0 +1,95 @@
+import pytest
+from sqlalchemy import event, insert
+
+from app.quiz.models import AnswerModel, QuestionModel, ThemeModel
+from app.store.quiz.accessor import QUESTION_LOADERS
+
+THEMES = 100
+QUESTIONS_PER_THEME = 50
+ANSWERS_PER_QUESTION = 4
+LARGE_TABLES = ("questions", "answers")
+
+
+@pytest.fixture
+async def seeded(server):
+    engine = server.database._engine
+    async with engine.begin() as conn:
+        await conn.execute(
+            insert(ThemeModel), [{"title": f"theme {i}"} for i in range(THEMES)]
+        )
+        await conn.execute(
+            insert(QuestionModel),
+            [
+                {"title": f"question {i}", "theme_id": i % THEMES + 1}
+                for i in range(THEMES * QUESTIONS_PER_THEME)
+            ],
+        )
+        await conn.execute(
+            insert(AnswerModel),
+            [
+                {"title": str(j), "is_correct": j == 0, "question_id": i + 1}
+                for i in range(THEMES * QUESTIONS_PER_THEME)
+                for j in range(ANSWERS_PER_QUESTION)
+            ],
+        )
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for table in ("themes", *LARGE_TABLES):
+            await conn.exec_driver_sql(f"VACUUM ANALYZE {table}")
+
+
+@pytest.fixture
+def captured(server):
+    statements: list[tuple[str, tuple]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    sync_engine = server.database._engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(sync_engine, "before_cursor_execute", capture)
+
+
+async def explain(server, statements: list[tuple[str, tuple]]) -> list[str]:
+    plans = []
+    async with server.database._engine.connect() as conn:
+        for statement, parameters in list(statements):
+            rows = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+            plans.append("\n".join(row[0] for row in rows))
+    return plans
+
+
+def assert_no_seq_scans(plans: list[str]):
+    for plan in plans:
+        for table in LARGE_TABLES:
+            assert f"Seq Scan on {table}" not in plan, plan
+
+
+class TestQueryPlans:
+    @pytest.mark.parametrize("loader", QUESTION_LOADERS)
+    async def test_list_questions_by_theme(self, server, store, seeded, captured, loader):
+        questions = await store.quizzes.list_questions(theme_id=7, loader=loader)
+        assert len(questions) == QUESTIONS_PER_THEME
+        assert_no_seq_scans(await explain(server, captured))
+
+    async def test_answers_index_only(self, server, store, seeded, captured):
+        await store.quizzes.list_questions(theme_id=7)
+        (plan,) = await explain(server, captured)
+        assert "Index Only Scan using ix_answers_question_id" in plan, plan
+
+    async def test_paginated_questions(self, server, store, seeded, captured):
+        questions = await store.quizzes.list_questions(theme_id=7, limit=10, after_id=1000)
+        assert len(questions) == 10
+        questions = await store.quizzes.list_questions(limit=10, after_id=1000)
+        assert questions[0].id == 1001
+        assert_no_seq_scans(await explain(server, captured))
+
+    async def test_stream_questions(self, server, store, seeded, captured):
+        questions = [question async for question in store.quizzes.stream_questions(7)]
+        assert len(questions) == QUESTIONS_PER_THEME
+        assert_no_seq_scans(await explain(server, captured))
+
+    async def test_question_by_title(self, server, store, seeded, captured):
+        assert await store.quizzes.get_question_by_title("question 42")
+        assert_no_seq_scans(await explain(server, captured))
@@ -0,0 +1,127 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.game.models import Game
+from app.store import Database
+from app.store.database.database import UnitOfWork
+from app.web.middlewares import READ_YOUR_WRITES_COOKIE
+
+
+@pytest.fixture
+def database(server, mocker) -> Database:
+    mocker.patch.object(server.database, "replica_session", MagicMock())
+    return server.database
+
+
+class TestReadWriteRouting:
+    async def test_read_goes_to_replica(self, cli, database: Database):
+        assert database.read_session() is database.replica_session.begin()
+
+    async def test_primary_read(self, cli, database: Database):
+        assert database.read_session(primary=True) is not database.replica_session.begin()
+
+    async def test_read_your_writes(self, cli, store, database: Database):
+        await store.quizzes.create_theme("title")
+        assert database.read_session() is not database.replica_session.begin()
+        assert (await store.quizzes.get_theme_by_title("title")).title == "title"
+
+    async def test_game_flush_keeps_reads_on_replica(self, cli, store, database: Database):
+        store.games.add_game(
+            Game(id=uuid4(), chat_id=1, theme_id=None, started_at=datetime.now(timezone.utc))
+        )
+        await store.games.flush()
+        assert store.games.pending() == 0
+        assert database.read_session() is database.replica_session.begin()
+
+    async def test_cache_refilled_from_primary(self, cli, store, database: Database, mocker):
+        # Written by another task, such as another client's request.
+        await asyncio.create_task(store.quizzes.create_theme("title"))
+        read_session = mocker.spy(database, "read_session")
+        assert len(await store.quizzes.list_themes()) == 1
+        read_session.assert_called_once_with(primary=True)
+
+    async def test_admin_reads_own_writes(self, authed_cli, store, server, mocker):
+        resp = await authed_cli.post("/quiz.add_theme", json={"title": "title"})
+        assert resp.status == 200
+        assert READ_YOUR_WRITES_COOKIE in resp.cookies
+        # Only the client's own write should send the next read to the primary.
+        store.quizzes._invalidated_at = float("-inf")
+        get_read_session = mocker.spy(UnitOfWork, "get_read_session")
+        resp = await authed_cli.get("/quiz.list_themes")
+        assert resp.status == 200
+        assert get_read_session.call_args.args[1] is True
+
+
+class TestUnitOfWork:
+    async def test_calls_share_one_session(self, cli, store, server):
+        database = server.database
+        async with database.unit_of_work() as unit_of_work:
+            assert unit_of_work.session is None
+            theme = await store.quizzes.create_theme("title")
+            session = unit_of_work.session
+            async with database.read_session() as read_session:
+                assert read_session is session
+            assert (await store.quizzes.get_theme_by_title("title")) == theme
+        assert await store.quizzes.get_theme_by_title("title") == theme
+
+    async def test_reads_use_replica_until_first_write(self, cli, store, server, mocker):
+        database = server.database
+        replica = sessionmaker(database._engine, class_=AsyncSession, expire_on_commit=False)
+        mocker.patch.object(database, "replica_session", replica)
+        mocker.patch.object(database, "_replica_engine", database._engine)
+        async with database.unit_of_work() as unit_of_work:
+            assert await store.quizzes.get_theme_by_title("title") is None
+            assert unit_of_work.replica is not None
+            assert unit_of_work.session is None
+            await store.quizzes.create_theme("title")
+            async with database.read_session() as read_session:
+                assert read_session is unit_of_work.session
+
+    async def test_rolled_back_on_error(self, cli, store, server):
+        with pytest.raises(RuntimeError):
+            async with server.database.unit_of_work():
+                await store.quizzes.create_theme("title")
+                raise RuntimeError
+        assert await store.quizzes.get_theme_by_title("title") is None
+
+    async def test_failed_write_keeps_transaction(self, cli, store, server):
+        async with server.database.unit_of_work():
+            await store.quizzes.create_theme("first")
+            with pytest.raises(IntegrityError):
+                await store.quizzes.create_theme("first")
+            await store.quizzes.create_theme("second")
+        assert len(await store.quizzes.list_themes()) == 2
+
+    async def test_cache_invalidated_on_commit(self, cli, store, server):
+        assert await store.quizzes.list_themes() == []
+        async with server.database.unit_of_work():
+            await store.quizzes.create_theme("title")
+            # Another request reading meanwhile sees the committed state.
+            store.quizzes.cache.set(("themes",), [])
+        assert len(await store.quizzes.list_themes()) == 1
+
+    async def test_rolled_back_reads_not_cached(self, cli, store, server):
+        with pytest.raises(RuntimeError):
+            async with server.database.unit_of_work():
+                theme = await store.quizzes.create_theme("title")
+                assert await store.quizzes.get_theme_by_id(theme.id) == theme
+                assert len(await store.quizzes.list_themes()) == 1
+                raise RuntimeError
+        assert len(store.quizzes.cache) == 0
+        assert await store.quizzes.list_themes() == []
+
+    async def test_one_checkout_per_request(self, authed_cli, server, mocker):
+        database = server.database
+        checkouts = mocker.spy(database, "session")
+        resp = await authed_cli.post("/quiz.add_theme", json={"title": "title"})
+        assert resp.status == 200
+        resp = await authed_cli.get("/quiz.list_themes")
+        assert resp.status == 200
+        assert checkouts.call_count == 2
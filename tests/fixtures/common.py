@@ -53,12 +53,17 @@ def db_session(server):
 @pytest.fixture(autouse=True, scope="function")
 async def clear_db(server):
     yield
+    server.store.quizzes.cache.clear()
+    server.store.quizzes.reset_question_index()
+    server.auth_cache.clear()
+    server.store.games.discard()
+    server.store.bots_manager.game.states.clear()
+    server.store.scheduler.wheel.clear()
     try:
         session = AsyncSession(server.database._engine)
         connection = session.connection()
         for table in server.database._db.metadata.tables:
-            await session.execute(text(f"TRUNCATE {table} CASCADE"))
-            await session.execute(text(f"ALTER SEQUENCE {table}_id_seq RESTART WITH 1"))
+            await session.execute(text(f"TRUNCATE {table} RESTART IDENTITY CASCADE"))
 
         await session.commit()
         connection.close()
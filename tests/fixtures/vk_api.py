@@ -0,0 +1,88 @@
+import dataclasses
+import json
+import re
+from unittest.mock import MagicMock
+
+import pytest
+from aiohttp import web
+
+from app.store.vk_api.accessor import VkApiAccessor
+
+SEND_CALL = re.compile(r"API\.messages\.send\((\{.*?\})\)")
+
+
+class FakeVkServer:
+    """Minimal stand-in for the VK API: records calls and replays errors."""
+
+    def __init__(self):
+        self.errors: list[int] = []
+        self.calls: list[tuple[str, dict]] = []
+        self.sent: list[dict] = []
+        self.query_strings: list[str] = []
+        self.server = None
+        self.long_poll_responses: list[dict | None] = []
+        self.long_poll_server_ts = 1
+        self.app = web.Application()
+        self.app.router.add_post("/method/{method}", self.handle_method)
+        self.app.router.add_get("/lp", self.handle_long_poll)
+
+    async def handle_long_poll(self, request: web.Request) -> web.Response:
+        self.calls.append(("a_check", dict(request.query)))
+        if not self.long_poll_responses:
+            return web.json_response({"ts": request.query["ts"], "updates": []})
+        response = self.long_poll_responses.pop(0)
+        if response is None:
+            return web.Response(status=502, text="Bad Gateway")
+        return web.json_response(response)
+
+    async def handle_method(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        params = dict(await request.post())
+        self.calls.append((method, params))
+        self.query_strings.append(request.query_string)
+        if self.errors:
+            return web.json_response(
+                {"error": {"error_code": self.errors.pop(0), "error_msg": "fake"}}
+            )
+        if method == "groups.getLongPollServer":
+            return web.json_response(
+                {
+                    "response": {
+                        "key": f"key{len(self.calls)}",
+                        "server": str(self.server.make_url("/lp")),
+                        "ts": self.long_poll_server_ts,
+                    }
+                }
+            )
+        if method == "execute":
+            messages = [json.loads(call) for call in SEND_CALL.findall(params["code"])]
+            self.sent.extend(messages)
+            return web.json_response(
+                {"response": list(range(len(self.sent) - len(messages), len(self.sent)))}
+            )
+        return web.json_response({"error": {"error_code": 3, "error_msg": "unknown method"}})
+
+
+@pytest.fixture
+async def fake_vk(aiohttp_server) -> FakeVkServer:
+    fake = FakeVkServer()
+    fake.server = await aiohttp_server(fake.app)
+    return fake
+
+
+@pytest.fixture
+async def vk_api(config, fake_vk: FakeVkServer) -> VkApiAccessor:
+    app = MagicMock()
+    app.config = dataclasses.replace(
+        config,
+        bot=dataclasses.replace(
+            config.bot,
+            api_path=str(fake_vk.server.make_url("/method/")),
+            retry_backoff=0.001,
+            send_window=0.001,
+        ),
+    )
+    accessor = VkApiAccessor(app)
+    accessor._open_sessions()
+    yield accessor
+    await accessor.disconnect(app)
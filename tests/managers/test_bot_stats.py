@@ -0,0 +1,28 @@
+from unittest.mock import MagicMock
+
+from app.store import Store
+
+
+class TestAdminBotStatsView:
+    async def test_unauthorized(self, cli):
+        resp = await cli.get("/admin.bot_stats")
+        assert resp.status == 401
+        data = await resp.json()
+        assert data["status"] == "unauthorized"
+
+    async def test_success(self, authed_cli, store: Store, mocker):
+        stats = {
+            "poller": {"queue_depth": 3, "lag": 0.5, "max_lag": 1.5, "handled": 10},
+            "long_poll": {
+                "reconnects": 2,
+                "consecutive_failures": 0,
+                "skipped_updates": 1,
+                "latency": {"count": 5, "sum": 2.5, "buckets": {"0.5": 4, "inf": 5}},
+            },
+        }
+        mocker.patch.object(store.vk_api, "stats", MagicMock(return_value=stats))
+        resp = await authed_cli.get("/admin.bot_stats")
+        assert resp.status == 200
+        data = await resp.json()
+        assert data["status"] == "ok"
+        assert data["data"] == stats
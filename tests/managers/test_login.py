@@ -1,3 +1,10 @@
+import asyncio
+from hashlib import sha256
+from time import monotonic
+
+import pytest
+
+from app.base.passwords import PasswordHasher
 from app.store import Store
 from tests.utils import ok_response
 
@@ -28,6 +35,51 @@ class TestAdminLoginView:
             }
         )
 
+    async def test_legacy_hash_upgraded(self, cli, store: Store, config):
+        legacy = sha256(config.admin.password.encode()).hexdigest()
+        assert (await store.admins.get_by_email(config.admin.email)).password == legacy
+
+        resp = await cli.post(
+            "/admin.login",
+            json={"email": config.admin.email, "password": config.admin.password},
+        )
+        assert resp.status == 200
+        admin = await store.admins.get_by_email(config.admin.email)
+        assert admin.password.startswith("scrypt$")
+        assert not store.admins.hasher.needs_rehash(admin.password)
+
+        resp = await cli.post(
+            "/admin.login",
+            json={"email": config.admin.email, "password": config.admin.password},
+        )
+        assert resp.status == 200
+
+    async def test_no_connection_held_while_hashing(
+        self, cli, store: Store, server, config, mocker
+    ):
+        verify = store.admins.hasher.verify
+        checked_out = []
+
+        async def checking_verify(*args):
+            checked_out.append(server.database.pool_stats()["checked_out"])
+            return await verify(*args)
+
+        mocker.patch.object(store.admins.hasher, "verify", checking_verify)
+        before = server.database.pool_stats()["checked_out"]
+        resp = await cli.post(
+            "/admin.login",
+            json={"email": config.admin.email, "password": config.admin.password},
+        )
+        assert resp.status == 200
+        assert checked_out == [before]
+
+    async def test_wrong_password(self, cli, config):
+        resp = await cli.post(
+            "/admin.login",
+            json={"email": config.admin.email, "password": "qwerty"},
+        )
+        assert resp.status == 403
+
     async def test_missed_email(self, cli):
         resp = await cli.post(
             "/admin.login",
@@ -52,6 +104,24 @@ class TestAdminLoginView:
         data = await resp.json()
         assert data["status"] == "forbidden"
 
+    async def test_unknown_email_costs_a_hash(self, cli, store: Store, mocker):
+        verify_dummy = mocker.spy(store.admins.hasher, "verify_dummy")
+        resp = await cli.post(
+            "/admin.login",
+            json={"email": "qwerty", "password": "qwerty"},
+        )
+        assert resp.status == 403
+        verify_dummy.assert_awaited_once_with("qwerty")
+
+    async def test_corrupted_hash(self, cli, store: Store, config):
+        admin = await store.admins.get_by_email(config.admin.email)
+        await store.admins._update_password(admin, "scrypt$16384$8$1$c2Fsd$a2V5")
+        resp = await cli.post(
+            "/admin.login",
+            json={"email": config.admin.email, "password": config.admin.password},
+        )
+        assert resp.status == 403
+
     async def test_different_method(self, cli):
         resp = await cli.get(
             "/admin.login",
@@ -63,3 +133,56 @@ class TestAdminLoginView:
         assert resp.status == 405
         data = await resp.json()
         assert data["status"] == "not_implemented"
+
+
+class TestPasswordHasher:
+    async def test_hash_and_verify(self):
+        hasher = PasswordHasher(n=2**10)
+        hashed = await hasher.hash("admin")
+        assert hashed != await hasher.hash("admin")
+        assert await hasher.verify("admin", hashed)
+        assert not await hasher.verify("qwerty", hashed)
+        assert not hasher.needs_rehash(hashed)
+        assert PasswordHasher(n=2**11).needs_rehash(hashed)
+        hasher.close()
+
+    async def test_legacy_sha256(self):
+        hasher = PasswordHasher(n=2**10)
+        legacy = sha256(b"admin").hexdigest()
+        assert await hasher.verify("admin", legacy)
+        assert not await hasher.verify("qwerty", legacy)
+        assert hasher.needs_rehash(legacy)
+        assert not await hasher.verify("admin", "bcrypt$whatever")
+
+    @pytest.mark.parametrize(
+        "hashed",
+        ["scrypt$x$8$1$c2FsdA==$a2V5", "scrypt$1024$8$1$c2Fsd$a2V5", "scrypt$1000$8$1$c2FsdA==$a2V5"],
+    )
+    async def test_malformed_hash(self, hashed: str):
+        hasher = PasswordHasher(n=2**10)
+        assert not await hasher.verify("admin", hashed)
+        hasher.close()
+
+    async def test_does_not_block_event_loop(self):
+        hasher = PasswordHasher(concurrency=2)
+        max_gap = 0.0
+
+        async def ticker(done: asyncio.Event):
+            nonlocal max_gap
+            last = monotonic()
+            while not done.is_set():
+                await asyncio.sleep(0.005)
+                now = monotonic()
+                max_gap = max(max_gap, now - last)
+                last = now
+
+        done = asyncio.Event()
+        tick = asyncio.create_task(ticker(done))
+        hashes = await asyncio.gather(*[hasher.hash("admin") for _ in range(6)])
+        done.set()
+        await tick
+        hasher.close()
+
+        assert len(set(hashes)) == 6
+        # A single scrypt call takes tens of milliseconds.
+        assert max_gap < 0.05
@@ -0,0 +1,14 @@
+class TestAdminPoolStatsView:
+    async def test_unauthorized(self, cli):
+        resp = await cli.get("/admin.pool_stats")
+        assert resp.status == 401
+        data = await resp.json()
+        assert data["status"] == "unauthorized"
+
+    async def test_success(self, authed_cli, config):
+        resp = await authed_cli.get("/admin.pool_stats")
+        assert resp.status == 200
+        data = await resp.json()
+        assert data["status"] == "ok"
+        assert data["data"]["size"] == config.database.pool.size
+        assert data["data"]["checked_out"] >= 0
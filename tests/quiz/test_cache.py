@@ -0,0 +1,74 @@
+from app.base.cache import TTLCache
+from app.quiz.models import Answer, Question, Theme
+from app.store import Store
+
+
+class TestTTLCache:
+    def test_hit_and_miss(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        assert cache.get(("a",)) is None
+        cache.set(("a",), 1)
+        assert cache.get(("a",)) == 1
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set(("a",), 1)
+        cache.set(("b",), 2)
+        cache.get(("a",))
+        cache.set(("c",), 3)
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) == 1
+        assert cache.get(("c",)) == 3
+
+    def test_ttl_expiration(self):
+        cache = TTLCache(maxsize=2, ttl=-1)
+        cache.set(("a",), 1)
+        assert cache.get(("a",)) is None
+        assert len(cache) == 0
+
+    def test_delete(self):
+        cache = TTLCache()
+        cache.set(("questions", 1), [])
+        cache.set(("questions", 1, 2), [])
+        cache.delete(("questions", 1))
+        cache.delete(("questions", 3))
+        assert cache.get(("questions", 1)) is None
+        assert cache.get(("questions", 1, 2)) == []
+
+    def test_invalidate_prefix(self):
+        cache = TTLCache()
+        cache.set(("questions", None), [])
+        cache.set(("questions", 1), [])
+        cache.set(("questions", 2), [])
+        cache.invalidate("questions", 1)
+        assert cache.get(("questions", 1)) is None
+        assert cache.get(("questions", 2)) == []
+        assert cache.get(("questions", None)) == []
+
+
+class TestQuizAccessorCache:
+    async def test_list_themes_cached(self, store: Store, theme_1: Theme):
+        hits = store.quizzes.cache.hits
+        assert await store.quizzes.list_themes() == [theme_1]
+        assert await store.quizzes.list_themes() == [theme_1]
+        assert store.quizzes.cache.hits == hits + 1
+
+    async def test_create_theme_invalidates(self, store: Store, theme_1: Theme):
+        await store.quizzes.list_themes()
+        theme = await store.quizzes.create_theme("new")
+        assert await store.quizzes.list_themes() == [theme_1, theme]
+
+    async def test_create_question_invalidates(
+        self, store: Store, question_1: Question, answers: list[Answer]
+    ):
+        assert await store.quizzes.list_questions() == [question_1]
+        assert await store.quizzes.list_questions(question_1.theme_id) == [question_1]
+        question = await store.quizzes.create_question(
+            "title", question_1.theme_id, answers
+        )
+        assert await store.quizzes.list_questions() == [question_1, question]
+        assert await store.quizzes.list_questions(question_1.theme_id) == [
+            question_1,
+            question,
+        ]
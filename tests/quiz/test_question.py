@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from sqlalchemy import delete
 from sqlalchemy.exc import IntegrityError
@@ -5,6 +7,7 @@ from sqlalchemy.future import select
 
 from app.quiz.models import Answer, AnswerModel, Question, QuestionModel, Theme
 from app.store import Store
+from app.store.quiz.accessor import QUESTION_LOADERS
 from tests.quiz import question2dict
 from tests.utils import check_empty_table_exists
 from tests.utils import ok_response
@@ -75,6 +78,18 @@ class TestQuestionsStore:
         questions = await store.quizzes.list_questions()
         assert questions == [question_1, question_2]
 
+    @pytest.mark.parametrize("loader", QUESTION_LOADERS)
+    async def test_loaders(
+        self, cli, store: Store, loader: str, question_1: Question, question_2: Question
+    ):
+        assert await store.quizzes.list_questions(loader=loader) == [
+            question_1,
+            question_2,
+        ]
+        assert question_2 == await store.quizzes.get_question_by_title(
+            question_2.title, loader=loader
+        )
+
     async def test_check_cascade_delete(self, cli, question_1: Question):
         async with cli.app.database.session() as session:
             await session.execute(
@@ -167,6 +182,28 @@ class TestQuestionAddView:
         )
         assert resp.status == 404
 
+    async def test_conflict(self, authed_cli, question_1: Question):
+        resp = await authed_cli.post(
+            "/quiz.add_question",
+            json={
+                "title": question_1.title,
+                "theme_id": question_1.theme_id,
+                "answers": [
+                    {
+                        "title": "2",
+                        "is_correct": False,
+                    },
+                    {
+                        "title": "8",
+                        "is_correct": True,
+                    },
+                ],
+            },
+        )
+        assert resp.status == 409
+        data = await resp.json()
+        assert data["status"] == "conflict"
+
     async def test_all_answers_are_correct(self, authed_cli, theme_1):
         resp = await authed_cli.post(
             "/quiz.add_question",
@@ -254,3 +291,143 @@ class TestQuestionListView:
         assert data == ok_response(
             data={"questions": [question2dict(question_1), question2dict(question_2)]}
         )
+
+    async def test_keyset_pagination(
+        self, authed_cli, question_1: Question, question_2: Question
+    ):
+        resp = await authed_cli.get("/quiz.list_questions", params={"limit": 1})
+        assert resp.status == 200
+        data = await resp.json()
+        assert data == ok_response(data={"questions": [question2dict(question_1)]})
+
+        resp = await authed_cli.get(
+            "/quiz.list_questions",
+            params={"limit": 1, "after_id": data["data"]["questions"][-1]["id"]},
+        )
+        assert resp.status == 200
+        data = await resp.json()
+        assert data == ok_response(data={"questions": [question2dict(question_2)]})
+
+    async def test_stream(self, authed_cli, question_1: Question, question_2: Question):
+        resp = await authed_cli.get("/quiz.list_questions", params={"stream": "true"})
+        assert resp.status == 200
+        assert resp.content_type == "application/x-ndjson"
+        lines = (await resp.text()).splitlines()
+        assert [json.loads(line) for line in lines] == [
+            question2dict(question_1),
+            question2dict(question_2),
+        ]
+
+
+class TestQuestionImportView:
+    @staticmethod
+    def question(title: str, theme_id: int, correct: int = 1) -> dict:
+        return {
+            "title": title,
+            "theme_id": theme_id,
+            "answers": [
+                {"title": str(i), "is_correct": i < correct} for i in range(2)
+            ],
+        }
+
+    async def test_unauthorized(self, cli):
+        resp = await cli.post("/quiz.import_questions", json=[])
+        assert resp.status == 401
+
+    async def test_bad_body(self, authed_cli):
+        resp = await authed_cli.post("/quiz.import_questions", json={})
+        assert resp.status == 400
+
+    async def test_json_array(
+        self, authed_cli, store: Store, theme_1: Theme, question_1: Question
+    ):
+        resp = await authed_cli.post(
+            "/quiz.import_questions",
+            json=[
+                self.question("first", theme_1.id),
+                self.question("invalid", theme_1.id, correct=2),
+                self.question("no theme", theme_1.id + 100),
+                self.question(question_1.title, theme_1.id),
+                self.question("second", theme_1.id),
+                self.question("second", theme_1.id),
+            ],
+        )
+        assert resp.status == 200
+        data = (await resp.json())["data"]
+        assert data["created"] == 2
+        assert data["failed"] == 4
+        assert [result["status"] for result in data["results"]] == [
+            "created",
+            "invalid",
+            "theme_not_found",
+            "conflict",
+            "created",
+            "conflict",
+        ]
+        assert "answers" in data["results"][1]["errors"]
+
+        question = await store.quizzes.get_question_by_title("second")
+        assert question.id == data["results"][4]["id"]
+        assert question.answers == [
+            Answer(title="0", is_correct=True),
+            Answer(title="1", is_correct=False),
+        ]
+
+    @pytest.mark.parametrize("is_correct", [None, "maybe"])
+    async def test_bad_is_correct(self, authed_cli, theme_1: Theme, is_correct):
+        question = self.question("bad", theme_1.id)
+        if is_correct is None:
+            del question["answers"][1]["is_correct"]
+        else:
+            question["answers"][1]["is_correct"] = is_correct
+        resp = await authed_cli.post(
+            "/quiz.import_questions",
+            json=[question, self.question("good", theme_1.id)],
+        )
+        assert resp.status == 200
+        data = (await resp.json())["data"]
+        assert [result["status"] for result in data["results"]] == ["invalid", "created"]
+        assert "is_correct" in data["results"][0]["errors"]["answers"]["1"]
+
+    async def test_invalid_answer(self, authed_cli, theme_1: Theme):
+        question = self.question("first", theme_1.id)
+        question["answers"][0]["title"] = None
+        resp = await authed_cli.post("/quiz.import_questions", json=[question])
+        assert resp.status == 200
+        data = (await resp.json())["data"]
+        assert data["results"][0]["status"] == "invalid"
+        assert "title" in data["results"][0]["errors"]["answers"]["0"]
+
+    async def test_larger_than_client_max_size(self, authed_cli, theme_1: Theme):
+        title = "x" * 1024
+        rows = [self.question(f"{title}{i}", theme_1.id + 100) for i in range(1100)]
+        resp = await authed_cli.post(
+            "/quiz.import_questions", json=[self.question("first", theme_1.id), *rows]
+        )
+        assert resp.status == 200
+        data = (await resp.json())["data"]
+        assert data["created"] == 1
+        assert data["failed"] == 1100
+
+    async def test_too_large(self, authed_cli, theme_1: Theme, mocker):
+        mocker.patch("app.quiz.views.IMPORT_MAX_SIZE", 100)
+        resp = await authed_cli.post(
+            "/quiz.import_questions",
+            json=[self.question(str(i), theme_1.id) for i in range(10)],
+        )
+        assert resp.status == 413
+        data = await resp.json()
+        assert data["status"] == "request_entity_too_large"
+
+    async def test_ndjson(self, authed_cli, store: Store, theme_1: Theme):
+        lines = [json.dumps(self.question(f"q{i}", theme_1.id)) for i in range(3)]
+        resp = await authed_cli.post(
+            "/quiz.import_questions",
+            data="\n".join([*lines, "{not json"]) + "\n",
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert resp.status == 200
+        data = (await resp.json())["data"]
+        assert data["created"] == 3
+        assert data["results"][3]["status"] == "invalid"
+        assert len(await store.quizzes.list_questions(theme_1.id)) == 3
@@ -0,0 +1,87 @@
+from collections import Counter
+
+import pytest
+
+from app.quiz.models import Answer
+from app.store import Store
+from app.store.quiz.sampler import QuestionSampler
+
+
+class TestQuestionSampler:
+    def test_draws_without_replacement(self):
+        ids = list(range(100, 110))
+        sampler = QuestionSampler(ids)
+        drawn = [sampler.draw() for _ in range(10)]
+        assert sorted(drawn) == ids
+        assert sampler.draw() is None
+        assert ids == list(range(100, 110))
+
+    def test_sample_is_bounded(self):
+        sampler = QuestionSampler([1, 2, 3])
+        assert len(sampler.sample(5)) == 3
+        assert sampler.sample(1) == []
+
+    def test_sees_appended_ids(self):
+        ids = [1]
+        sampler = QuestionSampler(ids)
+        assert sampler.draw() == 1
+        ids.append(2)
+        assert sampler.draw() == 2
+
+    def test_uniform(self):
+        counts = Counter(QuestionSampler([1, 2, 3]).draw() for _ in range(6000))
+        assert all(1700 < count < 2300 for count in counts.values())
+
+
+class TestQuestionIndex:
+    async def test_built_from_database(self, store: Store, theme_1, question_1, question_2):
+        sampler = await store.quizzes.question_sampler(theme_1.id)
+        assert sorted(sampler.sample(10)) == [question_1.id, question_2.id]
+        assert len(await store.quizzes.question_sampler()) == 2
+        assert len(await store.quizzes.question_sampler(theme_1.id + 1)) == 0
+
+    async def test_updated_on_create(self, store: Store, theme_1, theme_2, question_1):
+        sampler = await store.quizzes.question_sampler(theme_2.id)
+        assert len(sampler) == 0
+        question = await store.quizzes.create_question(
+            "new", theme_2.id, [Answer("1", True), Answer("2", False)]
+        )
+        assert sampler.draw() == question.id
+        assert len(await store.quizzes.question_sampler()) == 2
+
+    async def test_not_updated_on_rollback(self, store: Store, server, theme_1):
+        await store.quizzes.question_sampler()
+        with pytest.raises(RuntimeError):
+            async with server.database.unit_of_work():
+                await store.quizzes.create_question(
+                    "new", theme_1.id, [Answer("1", True), Answer("2", False)]
+                )
+                raise RuntimeError
+        assert len(await store.quizzes.question_sampler()) == 0
+
+    async def test_question_committed_while_building(
+        self, store: Store, server, theme_1, question_1, mocker
+    ):
+        read_session = server.database.read_session
+
+        def racing_read_session(*args, **kwargs):
+            # Questions committed as the index query starts: one it sees, one it misses.
+            store.quizzes._index_questions([(question_1.id, theme_1.id), (1000, theme_1.id)])
+            return read_session(*args, **kwargs)
+
+        mocker.patch.object(server.database, "read_session", racing_read_session)
+        await store.quizzes.question_sampler()
+        assert store.quizzes.all_question_ids == [question_1.id, 1000]
+        assert store.quizzes.question_ids == {theme_1.id: [question_1.id, 1000]}
+
+
+class TestGetQuestions:
+    async def test_order_and_unknown_ids(self, store: Store, question_1, question_2):
+        questions = await store.quizzes.get_questions([question_2.id, 1000, question_1.id])
+        assert questions == [question_2, question_1]
+
+    async def test_cached(self, store: Store, server, question_1, mocker):
+        await store.quizzes.get_questions([question_1.id])
+        read_session = mocker.spy(server.database, "read_session")
+        assert await store.quizzes.get_questions([question_1.id]) == [question_1]
+        read_session.assert_not_called()
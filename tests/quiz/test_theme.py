@@ -35,6 +35,11 @@ class TestThemeStore:
             await store.quizzes.create_theme(theme_1.title)
         assert exc_info.value.orig.pgcode == "23505"
 
+    async def test_create_themes(self, cli, store: Store, theme_1: Theme):
+        themes = await store.quizzes.create_themes(["a", theme_1.title, "b", "a"])
+        assert [theme.title for theme in themes] == ["a", "b"]
+        assert await store.quizzes.list_themes() == [theme_1, *themes]
+
     async def test_get_theme_by_id(self, store: Store, theme_1: Theme):
         theme = await store.quizzes.get_theme_by_id(theme_1.id)
         assert theme == theme_1
@@ -118,6 +123,25 @@ class TestThemeAddView:
         assert data["status"] == "conflict"
 
 
+class TestThemeBulkAddView:
+    async def test_unauthorized(self, cli):
+        resp = await cli.post("/quiz.add_themes", json={"titles": ["a"]})
+        assert resp.status == 401
+
+    async def test_success(self, authed_cli, theme_1: Theme):
+        resp = await authed_cli.post(
+            "/quiz.add_themes", json={"titles": [theme_1.title, "backend"]}
+        )
+        assert resp.status == 200
+        data = await resp.json()
+        theme = Theme(id=data["data"]["themes"][0]["id"], title="backend")
+        assert data == ok_response(data={"themes": [theme2dict(theme)]})
+
+    async def test_missing_titles(self, authed_cli):
+        resp = await authed_cli.post("/quiz.add_themes", json={})
+        assert resp.status == 400
+
+
 class TestThemeList:
     async def test_unauthorized(self, cli):
         resp = await cli.get("/quiz.list_themes")
@@ -0,0 +1,165 @@
+import asyncio
+
+import pytest
+
+from app.store.vk_api.accessor import LONG_POLL_WAIT, VkApiAccessor, VkApiError
+from app.store.vk_api.dataclasses import Message
+from app.store.vk_api.rate_limiter import PRIORITY_LOW
+
+
+class TestSendMessages:
+    async def test_execute_batch(self, vk_api: VkApiAccessor, fake_vk):
+        await asyncio.gather(
+            vk_api.send_message(Message(user_id=1, text="a&b")),
+            vk_api.send_message(Message(user_id=2, text="c")),
+        )
+        assert [call[0] for call in fake_vk.calls] == ["execute"]
+        assert [message["message"] for message in fake_vk.sent] == ["a&b", "c"]
+
+    async def test_retry_on_flood_control(self, vk_api: VkApiAccessor, fake_vk):
+        fake_vk.errors = [6, 9]
+        await vk_api.send_message(Message(user_id=1, text="a"))
+        assert len(fake_vk.calls) == 3
+        assert len(fake_vk.sent) == 1
+
+    async def test_no_retry_on_fatal_error(self, vk_api: VkApiAccessor, fake_vk):
+        fake_vk.errors = [5]
+        with pytest.raises(VkApiError) as exc_info:
+            await vk_api.send_message(Message(user_id=1, text="a"))
+        assert exc_info.value.code == 5
+        assert len(fake_vk.calls) == 1
+
+    async def test_retries_exhausted(self, vk_api: VkApiAccessor, fake_vk):
+        fake_vk.errors = [6] * 10
+        with pytest.raises(VkApiError):
+            await vk_api.send_message(Message(user_id=1, text="a"))
+        assert len(fake_vk.calls) == vk_api.app.config.bot.max_retries + 1
+
+    async def test_post_body(self, vk_api: VkApiAccessor, fake_vk):
+        text = "a&b=c?#%" * 2000
+        await vk_api.send_message(Message(user_id=1, text=text))
+        assert fake_vk.sent[0]["message"] == text
+        assert fake_vk.sent[0]["peer_id"] == f"-{vk_api.app.config.bot.group_id}"
+        assert fake_vk.query_strings == [""]
+        assert fake_vk.calls[0][1]["access_token"] == vk_api.app.config.bot.token
+
+    async def test_params_not_mutated(self, vk_api: VkApiAccessor):
+        params = {"group_id": 1}
+        url, body = vk_api._build_request("groups.getById", params)
+        assert params == {"group_id": 1}
+        assert url.endswith("groups.getById")
+        assert body["v"]
+
+    async def test_bulk_messages(self, vk_api: VkApiAccessor, fake_vk):
+        await vk_api.send_message(Message(user_id=1, text="a"), priority=PRIORITY_LOW)
+        assert len(fake_vk.sent) == 1
+
+
+class TestLongPollServer:
+    async def test_get_long_poll_service(self, vk_api: VkApiAccessor, fake_vk):
+        fake_vk.errors = [10]
+        await vk_api._get_long_poll_service()
+        assert vk_api.key == "key2"
+        assert vk_api.ts == 1
+        assert [call[0] for call in fake_vk.calls] == ["groups.getLongPollServer"] * 2
+
+
+class TestLongPoll:
+    async def test_updates(self, vk_api: VkApiAccessor, fake_vk):
+        fake_vk.long_poll_responses = [
+            {
+                "ts": 2,
+                "updates": [
+                    {
+                        "type": "message_new",
+                        "object": {"id": 1, "user_id": 1, "body": "kek"},
+                    }
+                ],
+            }
+        ]
+        updates = await vk_api.poll()
+        assert [update.object.body for update in updates] == ["kek"]
+        assert vk_api.ts == 2
+        assert vk_api.poll_stats()["latency"]["count"] == 1
+
+    async def test_other_events_are_skipped(self, vk_api: VkApiAccessor, fake_vk):
+        fake_vk.long_poll_responses = [
+            {
+                "ts": 2,
+                "updates": [
+                    {"type": "group_join", "object": {"user_id": 1, "join_type": "join"}},
+                    {
+                        "type": "message_new",
+                        "object": {"id": 1, "user_id": 1, "body": "kek"},
+                    },
+                ],
+            }
+        ]
+        updates = await vk_api.poll()
+        assert [update.object.body for update in updates] == ["kek"]
+        assert vk_api.ts == 2
+        assert vk_api.poll_stats()["skipped_updates"] == 1
+
+    async def test_outdated_ts(self, vk_api: VkApiAccessor, fake_vk):
+        await vk_api._get_long_poll_service()
+        fake_vk.long_poll_responses = [{"failed": 1, "ts": 10}]
+        assert await vk_api.poll() == []
+        assert vk_api.ts == 10
+        assert vk_api.reconnects == 0
+
+    async def test_key_expired(self, vk_api: VkApiAccessor, fake_vk):
+        await vk_api._get_long_poll_service()
+        vk_api.ts = 5
+        fake_vk.long_poll_responses = [{"failed": 2}]
+        assert await vk_api.poll() == []
+        assert vk_api.key == "key3"
+        assert vk_api.ts == 5
+        assert vk_api.reconnects == 1
+
+    async def test_info_lost(self, vk_api: VkApiAccessor, fake_vk):
+        await vk_api._get_long_poll_service()
+        vk_api.ts = 5
+        fake_vk.long_poll_server_ts = 7
+        fake_vk.long_poll_responses = [{"failed": 3}]
+        assert await vk_api.poll() == []
+        assert vk_api.ts == 7
+        assert vk_api.reconnects == 1
+
+    async def test_network_error_backs_off(self, vk_api: VkApiAccessor, fake_vk):
+        await vk_api._get_long_poll_service()
+        fake_vk.long_poll_responses = [None, {"ts": 3, "updates": []}]
+        assert await vk_api.poll() == []
+        assert vk_api.poll_failures == 1
+        assert await vk_api.poll() == []
+        assert vk_api.poll_failures == 0
+        assert vk_api.ts == 3
+
+    async def test_startup_failure_recovers(self, vk_api: VkApiAccessor, fake_vk):
+        fake_vk.errors = [5]
+        assert await vk_api.poll() == []
+        assert vk_api.server is None
+        assert await vk_api.poll() == []
+        assert vk_api.server is not None
+
+
+class TestSessions:
+    async def test_separate_pools(self, vk_api: VkApiAccessor):
+        assert vk_api.session is not vk_api.long_poll_session
+        assert vk_api.session.connector is not vk_api.long_poll_session.connector
+        assert vk_api.long_poll_session.timeout.total > LONG_POLL_WAIT
+        assert vk_api.session.timeout.total == vk_api.app.config.bot.request_timeout
+
+
+class TestStats:
+    async def test_without_poller(self, vk_api: VkApiAccessor):
+        assert vk_api.stats() == {"poller": None, "long_poll": vk_api.poll_stats()}
+
+    async def test_long_poll(self, vk_api: VkApiAccessor, fake_vk):
+        await vk_api._get_long_poll_service()
+        fake_vk.long_poll_responses = [{"failed": 2}, {"ts": 3, "updates": []}]
+        await vk_api.poll()
+        await vk_api.poll()
+        stats = vk_api.stats()["long_poll"]
+        assert stats["reconnects"] == 1
+        assert stats["consecutive_failures"] == 0
+        assert stats["latency"]["count"] == 2
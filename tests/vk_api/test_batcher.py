@@ -0,0 +1,47 @@
+import asyncio
+
+from app.store.vk_api.batcher import MessageBatcher
+from app.store.vk_api.dataclasses import Message
+
+
+class TestMessageBatcher:
+    async def test_concurrent_sends_coalesce(self):
+        batches: list[list[Message]] = []
+
+        async def send_batch(messages: list[Message]):
+            batches.append(messages)
+            return [message.user_id for message in messages]
+
+        batcher = MessageBatcher(send_batch, max_size=25, window=0.01)
+        results = await asyncio.gather(
+            *(batcher.send(Message(user_id=i, text="hi")) for i in range(30))
+        )
+        assert results == list(range(30))
+        assert [len(batch) for batch in batches] == [25, 5]
+
+    async def test_failure_is_per_message(self):
+        async def send_batch(messages: list[Message]):
+            return [1, ValueError("failed")]
+
+        batcher = MessageBatcher(send_batch, window=0.01)
+        results = await asyncio.gather(
+            batcher.send(Message(user_id=1, text="ok")),
+            batcher.send(Message(user_id=2, text="fail")),
+            return_exceptions=True,
+        )
+        assert results[0] == 1
+        assert isinstance(results[1], ValueError)
+
+    async def test_close_flushes_pending(self):
+        sent: list[Message] = []
+
+        async def send_batch(messages: list[Message]):
+            sent.extend(messages)
+            return [None] * len(messages)
+
+        batcher = MessageBatcher(send_batch, window=60)
+        task = asyncio.create_task(batcher.send(Message(user_id=1, text="hi")))
+        await asyncio.sleep(0)
+        await batcher.close()
+        await task
+        assert len(sent) == 1
@@ -0,0 +1,93 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.store.vk_api.dataclasses import Update, UpdateObject
+from app.store.vk_api.poller import Poller
+
+
+def make_update(id_: int, user_id: int) -> Update:
+    return Update(
+        type="message_new",
+        object=UpdateObject(id=id_, user_id=user_id, body="kek"),
+    )
+
+
+@pytest.fixture
+def poller_store():
+    store = MagicMock()
+    store.bots_manager.handle_updates = AsyncMock()
+    return store
+
+
+class TestPoller:
+    async def test_updates_are_handled_by_workers(self, poller_store):
+        poller = Poller(poller_store, queue_size=10, workers=2)
+        batches = [[make_update(i, user_id=i % 2) for i in range(6)]]
+
+        async def poll():
+            if batches:
+                return batches.pop()
+            poller.is_running = False
+            return []
+
+        poller_store.vk_api.poll = AsyncMock(side_effect=poll)
+        await poller.start()
+        await poller.poll_task
+        await poller.stop()
+
+        handled = [
+            update
+            for call in poller_store.bots_manager.handle_updates.mock_calls
+            for update in call.args[0]
+        ]
+        assert sorted(update.object.id for update in handled) == list(range(6))
+        for user_id in (0, 1):
+            ids = [update.object.id for update in handled if update.object.user_id == user_id]
+            assert ids == sorted(ids)
+        assert poller.stats()["handled"] == 6
+        assert poller.stats()["queue_depth"] == 0
+
+    async def test_backpressure(self, poller_store):
+        release = asyncio.Event()
+
+        async def handle_updates(_):
+            await release.wait()
+
+        poller_store.bots_manager.handle_updates = AsyncMock(side_effect=handle_updates)
+        poller = Poller(poller_store, queue_size=1, workers=1)
+        poller.worker_tasks = [asyncio.create_task(poller.work(poller.queues[0]))]
+
+        await poller.put(make_update(1, user_id=1))
+        await asyncio.sleep(0)
+        await poller.put(make_update(2, user_id=1))
+        blocked = asyncio.create_task(poller.put(make_update(3, user_id=1)))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        assert poller.stats()["queue_depth"] == 1
+
+        release.set()
+        await blocked
+        await poller.stop()
+        assert poller.stats()["handled"] == 3
+
+    async def test_survives_unexpected_error(self, poller_store, mocker):
+        mocker.patch("app.store.vk_api.poller.POLL_ERROR_DELAY", 0)
+        results = [RuntimeError("boom"), [make_update(1, user_id=1)]]
+
+        async def poll():
+            if results:
+                result = results.pop(0)
+                if isinstance(result, Exception):
+                    raise result
+                return result
+            poller.is_running = False
+            return []
+
+        poller = Poller(poller_store, queue_size=10, workers=1)
+        poller_store.vk_api.poll = AsyncMock(side_effect=poll)
+        await poller.start()
+        await poller.poll_task
+        await poller.stop()
+        assert poller.stats()["handled"] == 1
@@ -0,0 +1,36 @@
+import asyncio
+from time import monotonic
+
+from app.store.vk_api.rate_limiter import PRIORITY_HIGH, PRIORITY_LOW, RateLimiter
+
+
+class TestRateLimiter:
+    async def test_burst_then_rate(self):
+        limiter = RateLimiter(rate=100, burst=5)
+        started = monotonic()
+        for _ in range(10):
+            await limiter.acquire()
+        assert monotonic() - started >= 0.04
+
+    async def test_high_priority_first(self):
+        limiter = RateLimiter(rate=50, burst=1)
+        await limiter.acquire()
+        order: list[str] = []
+
+        async def acquire(name: str, priority: int):
+            await limiter.acquire(priority)
+            order.append(name)
+
+        low = [asyncio.create_task(acquire(f"low{i}", PRIORITY_LOW)) for i in range(2)]
+        await asyncio.sleep(0)
+        high = asyncio.create_task(acquire("high", PRIORITY_HIGH))
+        await asyncio.gather(*low, high)
+        assert order == ["high", "low0", "low1"]
+
+    async def test_cancelled_waiter_is_skipped(self):
+        limiter = RateLimiter(rate=50, burst=1)
+        await limiter.acquire()
+        cancelled = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.wait_for(limiter.acquire(), timeout=1)
@@ -0,0 +1,32 @@
+from app.admin.models import Admin
+from app.admin.schemes import AdminSchema
+from app.quiz.models import Answer, Question, Theme
+from app.quiz.schemes import ListQuestionSchema, QuestionSchema, ThemeListSchema
+from app.web.serializers import dump, dumper
+
+
+class TestCompiledDumper:
+    def test_matches_marshmallow_for_nested_lists(self):
+        data = {
+            "questions": [
+                Question(
+                    id=1,
+                    title="How many legs does an octopus have?",
+                    theme_id=1,
+                    answers=[Answer(title="8", is_correct=True), Answer(title="2", is_correct=False)],
+                )
+            ]
+        }
+        assert dump(ListQuestionSchema, data) == ListQuestionSchema().dump(data)
+
+    def test_matches_marshmallow_for_dicts(self):
+        data = {"themes": [Theme(id=1, title="web"), Theme(id=2, title="sql")]}
+        assert dump(ThemeListSchema, data) == ThemeListSchema().dump(data)
+
+    def test_skips_load_only_fields(self):
+        admin = Admin(id=1, email="admin@admin.com", password="secret")
+        assert dump(AdminSchema, admin) == AdminSchema().dump(admin)
+        assert "password" not in dump(AdminSchema, admin)
+
+    def test_dumper_is_compiled_once(self):
+        assert dumper(QuestionSchema) is dumper(QuestionSchema)
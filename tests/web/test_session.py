@@ -0,0 +1,90 @@
+from unittest.mock import AsyncMock
+
+from aiohttp import web
+from aiohttp_session import get_session, new_session
+from aiohttp_session import setup as session_setup
+
+from app.base.cache import TTLCache
+from app.web.session import MemoryStorage
+
+
+class TestAuthMiddleware:
+    async def test_admin_is_cached_by_cookie(self, authed_cli, server):
+        resp = await authed_cli.get("/admin.current")
+        assert resp.status == 200
+        hits = server.auth_cache.stats()["hits"]
+
+        resp = await authed_cli.get("/admin.current")
+        assert resp.status == 200
+        assert (await resp.json())["data"]["id"] == 1
+        assert server.auth_cache.stats()["hits"] == hits + 1
+
+    async def test_public_route_skips_session(self, authed_cli, mocker):
+        get_admin = mocker.patch("app.web.middlewares.get_admin", AsyncMock())
+        resp = await authed_cli.get("/admin.login")
+        assert resp.status == 405
+        get_admin.assert_not_called()
+
+    async def test_unknown_cookie_is_unauthorized(self, cli, server):
+        cli.session.cookie_jar.update_cookies({"AIOHTTP_SESSION": "garbage"})
+        resp = await cli.get("/admin.current")
+        assert resp.status == 401
+        assert len(server.auth_cache) == 0
+
+
+async def login(request: web.Request) -> web.Response:
+    session = await new_session(request)
+    session["admin"] = {"id": 1}
+    return web.json_response({})
+
+
+async def current(request: web.Request) -> web.Response:
+    session = await get_session(request)
+    return web.json_response(session.get("admin"))
+
+
+class TestMemoryStorage:
+    async def test_round_trip(self, aiohttp_client):
+        app = web.Application()
+        session_setup(app, MemoryStorage())
+        app.router.add_post("/login", login)
+        app.router.add_get("/current", current)
+        client = await aiohttp_client(app)
+
+        resp = await client.get("/current")
+        assert await resp.json() is None
+
+        resp = await client.post("/login")
+        identity = resp.cookies["AIOHTTP_SESSION"].value
+        assert len(identity) < 64
+
+        resp = await client.get("/current")
+        assert await resp.json() == {"id": 1}
+
+    async def test_new_identity_on_save(self, aiohttp_client):
+        app = web.Application()
+        session_setup(app, MemoryStorage())
+        app.router.add_post("/login", login)
+        app.router.add_get("/current", current)
+        client = await aiohttp_client(app)
+
+        first = (await client.post("/login")).cookies["AIOHTTP_SESSION"].value
+        second = (await client.post("/login")).cookies["AIOHTTP_SESSION"].value
+        assert first != second
+
+    async def test_old_identity_is_forgotten(self, aiohttp_client):
+        auth_cache = TTLCache()
+        app = web.Application()
+        session_setup(app, MemoryStorage(auth_cache=auth_cache))
+        app.router.add_post("/login", login)
+        app.router.add_get("/current", current)
+        client = await aiohttp_client(app)
+
+        first = (await client.post("/login")).cookies["AIOHTTP_SESSION"].value
+        auth_cache.set((first,), {"id": 1})
+        await client.post("/login")
+        assert auth_cache.get((first,)) is None
+
+        client.session.cookie_jar.update_cookies({"AIOHTTP_SESSION": first})
+        resp = await client.get("/current")
+        assert await resp.json() is None